@@ -1,29 +1,57 @@
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox
-import copy
+
+from caro_engine import CaroEngine
+from caro_parallel import ParallelCaroSearch
+from tictactoe_engine import BitboardTicTacToe, TranspositionTable, coordinates
+from tictactoe_table import lookup, x_to_move
+
+# Số nước đi tối đa hiển thị trong cây quyết định (bàn cờ lớn có hàng trăm ô)
+MAX_DISPLAYED_MOVES = 10
 
 class MinimaxTicTacToe:
-    def __init__(self):
+    def __init__(self, size=3, win_length=3, time_budget=1.0, workers=1):
+        # size × size ô, thắng khi có win_length quân liên tiếp; bàn 3×3 dùng bảng
+        # nước đi hoàn hảo, bàn lớn hơn dùng CaroEngine với time_budget giây mỗi nước
+        # (workers > 1: tìm kiếm song song trên workers tiến trình)
+        self.size = size
+        self.win_length = win_length
+        self.time_budget = time_budget
+        self.workers = workers
+        self.parallel_search = None
+        self.is_classic = size == 3 and win_length == 3
+        
         self.window = tk.Tk()
         self.window.title("Minimax Tic-tac-toe Simulation")
         self.window.geometry("1200x800")
         self.window.configure(bg='#f0f0f0')
         
-        # Trạng thái bàn cờ ban đầu (đã có vài nước đi)
-        # X = 1, O = -1, Empty = 0
-        self.board = [
-            [1, 0, -1],   # X ở (0,0), O ở (0,2)
-            [0, 1, 0],    # X ở (1,1)
-            [0, 0, 0]     # Hàng dưới trống
-        ]
-        
-        self.current_player = -1  # Lượt O (MIN)
+        self.board, self.current_player = self.initial_board()
         self.game_tree = []
         self.step_index = 0
         
+        # Bảng chuyển vị đối xứng dùng chung cho mọi lần tìm kiếm trong ván
+        self.table = TranspositionTable()
+        self.last_search_nodes = 0
+        self.search_info = ""
+        
         self.setup_ui()
         self.update_board_display()
         
+    def initial_board(self):
+        # Trạng thái bàn cờ ban đầu và người đi tiếp
+        # X = 1, O = -1, Empty = 0
+        if self.is_classic:
+            board = [
+                [1, 0, -1],   # X ở (0,0), O ở (0,2)
+                [0, 1, 0],    # X ở (1,1)
+                [0, 0, 0]     # Hàng dưới trống
+            ]
+            return board, -1  # Lượt O (MIN)
+        # Bàn lớn: bắt đầu trống, X (MAX) đi trước
+        return [[0] * self.size for _ in range(self.size)], 1
+        
     def setup_ui(self):
         # Main frame
         main_frame = tk.Frame(self.window, bg='#f0f0f0')
@@ -34,7 +62,9 @@ class MinimaxTicTacToe:
         left_panel.pack(side=tk.LEFT, fill=tk.BOTH, padx=(0, 10))
         
         # Title
-        title_label = tk.Label(left_panel, text="Tic-tac-toe Minimax", 
+        title = ("Tic-tac-toe Minimax" if self.is_classic else
+                 f"Caro {self.size}×{self.size} ({self.win_length} quân) Minimax")
+        title_label = tk.Label(left_panel, text=title, 
                               font=('Arial', 16, 'bold'), bg='#ffffff')
         title_label.pack(pady=10)
         
@@ -42,14 +72,19 @@ class MinimaxTicTacToe:
         self.board_frame = tk.Frame(left_panel, bg='#ffffff')
         self.board_frame.pack(pady=10)
         
+        # Ô nhỏ dần theo kích thước bàn cờ
+        if self.size <= 3:
+            cell_width, cell_height, font_size, pad = 6, 3, 20, 2
+        else:
+            cell_width, cell_height, font_size, pad = 2, 1, max(8, 120 // self.size), 0
         self.buttons = []
-        for i in range(3):
+        for i in range(self.size):
             row = []
-            for j in range(3):
-                btn = tk.Button(self.board_frame, text='', width=6, height=3,
-                               font=('Arial', 20, 'bold'),
+            for j in range(self.size):
+                btn = tk.Button(self.board_frame, text='', width=cell_width, height=cell_height,
+                               font=('Arial', font_size, 'bold'),
                                command=lambda r=i, c=j: self.make_move(r, c))
-                btn.grid(row=i, column=j, padx=2, pady=2)
+                btn.grid(row=i, column=j, padx=pad, pady=pad)
                 row.append(btn)
             self.buttons.append(row)
         
@@ -75,6 +110,18 @@ class MinimaxTicTacToe:
                                   command=self.reset_game)
         self.reset_btn.pack(side=tk.LEFT, padx=5)
         
+        # Giữ bảng chuyển vị sang ván mới
+        self.keep_table = tk.BooleanVar(value=False)
+        # Kiểm chứng nước đi tra bảng bằng tìm kiếm đầy đủ
+        self.verify_search = tk.BooleanVar(value=False)
+        if self.is_classic:
+            tk.Checkbutton(left_panel, text="Giữ bảng chuyển vị giữa các ván",
+                           variable=self.keep_table, font=('Arial', 10),
+                           bg='#ffffff').pack(pady=5)
+            tk.Checkbutton(left_panel, text="Kiểm chứng bảng bằng tìm kiếm",
+                           variable=self.verify_search, font=('Arial', 10),
+                           bg='#ffffff').pack(pady=5)
+        
         # Right panel - Minimax tree
         right_panel = tk.Frame(main_frame, bg='#ffffff', relief=tk.RAISED, bd=2)
         right_panel.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
@@ -107,8 +154,8 @@ class MinimaxTicTacToe:
         self.status_label.pack(pady=10)
         
     def update_board_display(self):
-        for i in range(3):
-            for j in range(3):
+        for i in range(self.size):
+            for j in range(self.size):
                 btn = self.buttons[i][j]
                 if self.board[i][j] == 1:
                     btn.config(text='X', bg='#ffcdd2', fg='#d32f2f')
@@ -124,111 +171,96 @@ class MinimaxTicTacToe:
             self.update_board_display()
             self.clear_tree_display()
     
+    def engine(self, board):
+        # Lõi tìm kiếm cho bàn cờ: bitboard với 3×3, CaroEngine với bàn lớn hơn
+        if self.is_classic:
+            return BitboardTicTacToe.from_board(board)
+        return CaroEngine.from_board(board, self.win_length)
+    
     def evaluate_board(self, board):
-        # Kiểm tra thắng thua
-        # Hàng
-        for row in board:
-            if abs(sum(row)) == 3:
-                return sum(row) // 3
-        
-        # Cột
-        for col in range(3):
-            col_sum = sum(board[row][col] for row in range(3))
-            if abs(col_sum) == 3:
-                return col_sum // 3
-        
-        # Đường chéo
-        diag1 = board[0][0] + board[1][1] + board[2][2]
-        diag2 = board[0][2] + board[1][1] + board[2][0]
-        
-        if abs(diag1) == 3:
-            return diag1 // 3
-        if abs(diag2) == 3:
-            return diag2 // 3
-        
-        return 0  # Hòa hoặc chưa kết thúc
+        # Kiểm tra thắng thua bằng lõi tìm kiếm
+        return self.engine(board).winner()
     
     def is_terminal(self, board):
-        # Kiểm tra thắng thua
-        if self.evaluate_board(board) != 0:
-            return True
-        
-        # Kiểm tra bàn cờ đầy
-        for row in board:
-            if 0 in row:
-                return False
-        return True
+        # Có người thắng hoặc bàn cờ đầy
+        return self.engine(board).is_terminal()
     
     def get_possible_moves(self, board):
         moves = []
-        for i in range(3):
-            for j in range(3):
+        for i in range(len(board)):
+            for j in range(len(board)):
                 if board[i][j] == 0:
                     moves.append((i, j))
         return moves
     
     def minimax(self, board, depth, is_maximizing, alpha=float('-inf'), beta=float('inf')):
-        score = self.evaluate_board(board)
-        
-        # Điều kiện dừng
-        if score != 0:
-            return score
-        
-        if self.is_terminal(board) or depth == 0:
-            return score
-        
-        moves = self.get_possible_moves(board)
-        
-        if is_maximizing:  # MAX player (X)
-            max_eval = float('-inf')
-            for move in moves:
-                new_board = copy.deepcopy(board)
-                new_board[move[0]][move[1]] = 1
-                eval_score = self.minimax(new_board, depth - 1, False, alpha, beta)
-                max_eval = max(max_eval, eval_score)
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
-            return max_eval
-        else:  # MIN player (O)
-            min_eval = float('inf')
-            for move in moves:
-                new_board = copy.deepcopy(board)
-                new_board[move[0]][move[1]] = -1
-                eval_score = self.minimax(new_board, depth - 1, True, alpha, beta)
-                min_eval = min(min_eval, eval_score)
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
-            return min_eval
+        # Tìm kiếm tại chỗ (đặt/gỡ nước đi), không deepcopy
+        if self.is_classic:
+            return BitboardTicTacToe.from_board(board).minimax(depth, is_maximizing, alpha, beta)
+        engine = CaroEngine.from_board(board, self.win_length)
+        engine.deadline = float('inf')
+        return engine.search(depth, is_maximizing, alpha, beta, 0)
     
     def get_best_move(self, board, is_maximizing):
-        best_move = None
+        # Trả về (nước đi tốt nhất, điểm, danh sách (nước đi, điểm)) bằng cách tra
+        # bảng nước đi hoàn hảo; chỉ tìm kiếm khi thế cờ không có trong bảng
+        # (bàn cờ không đạt được từ bàn trống hoặc sai lượt đi)
+        if not self.is_classic:
+            return self.caro_best_move(board, is_maximizing)
+        engine = BitboardTicTacToe.from_board(board)
+        x_bits, o_bits = engine.bits
+        entry = lookup(x_bits, o_bits) if x_to_move(x_bits, o_bits) == is_maximizing else None
+        if entry is None:
+            return self.search_best_move(board, is_maximizing)
+        
+        best_score, best_squares = entry
+        player = 1 if is_maximizing else -1
         moves_with_scores = []
-        
-        if is_maximizing:
-            best_score = float('-inf')
-            player = 1
-        else:
-            best_score = float('inf')
-            player = -1
-        
-        moves = self.get_possible_moves(board)
-        
-        for move in moves:
-            new_board = copy.deepcopy(board)
-            new_board[move[0]][move[1]] = player
-            score = self.minimax(new_board, 4, not is_maximizing)
-            moves_with_scores.append((move, score))
-            
-            if is_maximizing and score > best_score:
-                best_score = score
-                best_move = move
-            elif not is_maximizing and score < best_score:
-                best_score = score
-                best_move = move
-        
-        return best_move, best_score, moves_with_scores
+        for sq in engine.moves():
+            engine.make(sq, player)
+            moves_with_scores.append((coordinates(sq), lookup(*engine.bits)[0]))
+            engine.unmake(sq, player)
+        self.search_info = "Tra bảng nước đi hoàn hảo"
+        return coordinates(best_squares[0]), best_score, moves_with_scores
+    
+    def search_best_move(self, board, is_maximizing):
+        # Tìm kiếm alpha-beta đầy đủ (dự phòng và kiểm chứng); bảng chuyển vị giữ
+        # kết quả của các lần tìm trước trong ván
+        self.table.reset_stats()
+        engine = BitboardTicTacToe.from_board(board, self.table)
+        result = engine.best_move(is_maximizing, depth=9)
+        self.last_search_nodes = engine.nodes
+        self.search_info = self.table_stats_text()
+        return result
+    
+    def caro_best_move(self, board, is_maximizing):
+        # Bàn lớn: alpha-beta sâu dần trong time_budget giây
+        if self.workers > 1:
+            return self.parallel_best_move(board, is_maximizing)
+        engine = CaroEngine.from_board(board, self.win_length)
+        result = engine.best_move(is_maximizing, self.time_budget)
+        self.last_search_nodes = engine.nodes
+        self.search_info = (f"Alpha-beta sâu dần: độ sâu {engine.completed_depth}, "
+                            f"duyệt {engine.nodes} nút trong {self.time_budget:g}s")
+        return result
+    
+    def parallel_best_move(self, board, is_maximizing):
+        # Chia các nước ở gốc cho nhiều tiến trình; tạo tiến trình ở lần gọi đầu
+        if self.parallel_search is None:
+            self.parallel_search = ParallelCaroSearch(self.size, self.win_length, self.workers)
+        search = self.parallel_search
+        result = search.best_move(board, is_maximizing, self.time_budget)
+        self.last_search_nodes = search.nodes
+        self.search_info = (f"Alpha-beta song song ({search.workers} tiến trình): "
+                            f"độ sâu {search.completed_depth}, duyệt {search.nodes} nút "
+                            f"trong {self.time_budget:g}s, tìm lại {search.researches} lần")
+        return result
+    
+    def table_stats_text(self):
+        # Thống kê bảng chuyển vị của lần tìm kiếm gần nhất
+        return (f"Bảng chuyển vị: trúng {self.table.hit_rate:.0%} "
+                f"({self.table.hits}/{self.table.probes}), duyệt {self.last_search_nodes} nút, "
+                f"tiết kiệm ~{self.table.saved_nodes} nút, {len(self.table)} thế cờ đã lưu")
     
     def run_minimax(self):
         if self.is_terminal(self.board):
@@ -239,11 +271,17 @@ class MinimaxTicTacToe:
         player_name = "MAX (X)" if is_maximizing else "MIN (O)"
         
         best_move, best_score, all_moves = self.get_best_move(self.board, is_maximizing)
+        info = self.search_info
+        if self.is_classic and self.verify_search.get():
+            searched = self.search_best_move(self.board, is_maximizing)
+            verdict = "khớp" if searched == (best_move, best_score, all_moves) else "LỆCH"
+            info += f"\nKiểm chứng bằng tìm kiếm: {verdict} - {self.search_info}"
         
         self.display_minimax_tree(all_moves, best_move, is_maximizing)
         
         self.status_label.config(
-            text=f"{player_name} chọn nước đi tối ưu: ({best_move[0]}, {best_move[1]}) với điểm {best_score}"
+            text=f"{player_name} chọn nước đi tối ưu: ({best_move[0]}, {best_move[1]}) với điểm {best_score}\n"
+                 f"{info}"
         )
         
         # Thực hiện nước đi tối ưu
@@ -265,6 +303,13 @@ class MinimaxTicTacToe:
                          bg='#ffffff', fg=player_color)
         header.pack(pady=5)
         
+        # Bàn lớn: chỉ hiển thị nước tối ưu và các nước có điểm tốt nhất
+        if len(moves_with_scores) > MAX_DISPLAYED_MOVES:
+            sign = -1 if is_maximizing else 1
+            moves_with_scores = sorted(moves_with_scores,
+                                       key=lambda item: (item[0] != best_move, sign * item[1])
+                                       )[:MAX_DISPLAYED_MOVES]
+        
         # Moves analysis
         for i, (move, score) in enumerate(moves_with_scores):
             move_frame = tk.Frame(self.tree_frame, bg='#ffffff', relief=tk.RIDGE, bd=1)
@@ -303,22 +348,24 @@ class MinimaxTicTacToe:
     
     def reset_game(self):
         # Reset về trạng thái ban đầu
-        self.board = [
-            [1, 0, -1],
-            [0, 1, 0],
-            [0, 0, 0]
-        ]
-        self.current_player = -1
+        self.board, self.current_player = self.initial_board()
+        if not self.keep_table.get():
+            self.table.clear()
         self.update_board_display()
         self.clear_tree_display()
         self.status_label.config(text="Sẵn sàng chạy Minimax")
     
     def run(self):
-        self.window.mainloop()
+        try:
+            self.window.mainloop()
+        finally:
+            if self.parallel_search is not None:
+                self.parallel_search.close()
 
 if __name__ == "__main__":
-    game = MinimaxTicTacToe()
+    # python A.py [kích thước] [số quân liên tiếp] [số tiến trình], ví dụ: python A.py 15 5 4
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    win_length = int(sys.argv[2]) if len(sys.argv) > 2 else min(size, 5)
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    game = MinimaxTicTacToe(size, win_length, workers=workers)
     game.run()
-
-du lich
-dui qua
@@ -0,0 +1,418 @@
+import ctypes
+import multiprocessing
+import random
+import time
+from array import array
+
+from caro_eval import DIRECTIONS, LineCounts
+from tictactoe_engine import EXACT, LOWER, UPPER
+
+# Điểm thắng; thắng sớm hơn được điểm cao hơn (WIN_SCORE - số nước tới khi thắng)
+WIN_SCORE = 1000000
+# Điểm có trị tuyệt đối lớn hơn ngưỡng này là điểm thắng/thua (điểm đánh giá bị chặn dưới nó)
+MATE_THRESHOLD = WIN_SCORE // 2
+
+# Số thế hệ của bảng chuyển vị (5 bit trong mỗi mục)
+TABLE_GENERATIONS = 32
+
+# Hạt giống khóa Zobrist: mọi tiến trình cùng kích thước bàn cờ có cùng khóa
+ZOBRIST_SEED = 2024
+
+
+class SearchTimeout(Exception):
+    """Hết thời gian tìm kiếm (dùng nội bộ để thoát khỏi vòng lặp sâu dần)"""
+
+
+def to_table(value, ply):
+    """Điểm thắng/thua tính từ gốc -> tính từ nút ở độ cao ply (để lưu bảng)"""
+    if value > MATE_THRESHOLD:
+        return value + ply
+    if value < -MATE_THRESHOLD:
+        return value - ply
+    return value
+
+
+def from_table(value, ply):
+    """Ngược lại của to_table"""
+    if value > MATE_THRESHOLD:
+        return value - ply
+    if value < -MATE_THRESHOLD:
+        return value + ply
+    return value
+
+
+class CaroTable:
+    def __init__(self, bits=20, shared=False):
+        """
+        Bảng chuyển vị kích thước cố định 2^bits mục, chỉ số = khóa Zobrist & mask
+        - bits: log2 số mục
+        - shared: cấp phát trên bộ nhớ dùng chung (multiprocessing.RawArray) để
+          các tiến trình con của tìm kiếm song song cùng đọc và ghi
+        Mỗi mục gồm hai số int64: khóa XOR dữ liệu và dữ liệu (điểm, độ sâu, loại
+        cận, nước đi tốt nhất, thế hệ). Không dùng khóa: mục bị hai tiến trình ghi
+        xen nhau sẽ không khớp khóa khi tra và bị bỏ qua. Mục của thế hệ khác
+        self.generation chỉ còn dùng để sắp xếp nước đi, không dùng để cắt tỉa.
+        """
+        self.mask = (1 << bits) - 1
+        self.generation = 0
+        if shared:
+            self.keys = multiprocessing.RawArray('q', 1 << bits)
+            self.data = multiprocessing.RawArray('q', 1 << bits)
+        else:
+            self.keys = array('q', bytes(8 << bits))
+            self.data = array('q', bytes(8 << bits))
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Đặt lại bộ đếm của tiến trình hiện tại (giữ nguyên các mục đã lưu)"""
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key):
+        """(điểm, độ sâu, loại cận, nước đi tốt nhất hoặc -1) của khóa, None nếu không
+        có; mục của thế hệ cũ trả về độ sâu -1"""
+        self.probes += 1
+        index = key & self.mask
+        data = self.data[index]
+        if not data or self.keys[index] ^ data != key:
+            return None
+        self.hits += 1
+        depth = data >> 32 & 0xFF if data >> 58 == self.generation else -1
+        return ((data & 0xFFFFFFFF) - (1 << 31), depth,
+                data >> 40 & 0x3, (data >> 42 & 0xFFFF) - 1)
+
+    def store(self, key, value, depth, bound, move):
+        """Ghi đè mục của khóa (luôn thay thế) với thế hệ hiện tại"""
+        index = key & self.mask
+        data = ((value + (1 << 31)) | depth << 32 | bound << 40 | (move + 1) << 42
+                | self.generation << 58)
+        self.data[index] = data
+        self.keys[index] = key ^ data
+
+    def clear(self):
+        for entries in (self.keys, self.data):
+            if isinstance(entries, array):
+                entries[:] = array('q', bytes(8 * len(entries)))
+            else:
+                ctypes.memset(entries, 0, ctypes.sizeof(entries))
+        self.reset_stats()
+
+
+class CaroEngine:
+    def __init__(self, size=15, win_length=5, radius=2, table=None):
+        """
+        Lõi tìm kiếm cho cờ caro N × N, thắng khi có win_length quân liên tiếp
+        - size: kích thước bàn cờ (3 với win_length 3 là tic-tac-toe)
+        - win_length: số quân liên tiếp để thắng
+        - radius: chỉ xét các ô trống cách một quân bất kỳ không quá radius ô
+        - table: CaroTable dùng chung giữa các lần tìm kiếm (None = không dùng)
+        Ô (hàng, cột) ứng với chỉ số hàng * size + cột; X = 1 (MAX), O = -1 (MIN).
+        Tìm kiếm alpha-beta sâu dần theo ngân sách thời gian, sắp xếp nước đi bằng
+        killer, history và khoảng cách tới tâm; thế cờ chưa kết thúc được đánh giá
+        bằng số quân trên từng đoạn thắng (LineCounts), cập nhật theo từng nước.
+        """
+        if win_length > size:
+            raise ValueError("win_length không được lớn hơn kích thước bàn cờ")
+        self.size = size
+        self.win_length = win_length
+        self.radius = radius
+        num_cells = size * size
+        self.cells = [0] * num_cells
+        self.stack = []
+        # near[c] = số quân trong phạm vi radius quanh ô c
+        self.near = [0] * num_cells
+        # Điểm đánh giá luôn nhỏ hơn hẳn điểm thắng
+        self.lines = LineCounts(size, win_length, limit=MATE_THRESHOLD)
+        self.table = table
+        self.hash = 0
+        rng = random.Random(ZOBRIST_SEED)
+        self.zobrist = {player: [rng.getrandbits(63) for _ in range(num_cells)]
+                        for player in (1, -1)}
+        # Khóa thêm vào khi O (MIN) đi tiếp
+        self.side_key = rng.getrandbits(63)
+        self.nodes = 0
+        self.deadline = None
+        self.completed_depth = 0
+        self.killers = []
+        self.history = [0] * num_cells
+
+        center = (size - 1) / 2
+        self.center_rank = [max(abs(cell // size - center), abs(cell % size - center))
+                            for cell in range(num_cells)]
+        self.neighborhood = [
+            [r * size + c
+             for r in range(max(0, row - radius), min(size, row + radius + 1))
+             for c in range(max(0, col - radius), min(size, col + radius + 1))
+             if (r, c) != (row, col)]
+            for row, col in map(self.coordinates, range(num_cells))]
+        # rays[c] = với mỗi hướng, (các ô phía trước, các ô phía sau) tối đa win_length - 1 ô
+        self.rays = [[(self._ray(cell, dr, dc), self._ray(cell, -dr, -dc))
+                      for dr, dc in DIRECTIONS] for cell in range(num_cells)]
+
+    def _ray(self, cell, dr, dc):
+        row, col = self.coordinates(cell)
+        ray = []
+        for step in range(1, self.win_length):
+            r, c = row + dr * step, col + dc * step
+            if not (0 <= r < self.size and 0 <= c < self.size):
+                break
+            ray.append(r * self.size + c)
+        return ray
+
+    @classmethod
+    def from_board(cls, board, win_length=None, radius=2, table=None):
+        """Tạo từ bàn cờ dạng list N × N (X = 1, O = -1, trống = 0)"""
+        size = len(board)
+        engine = cls(size, win_length or min(size, 5), radius, table)
+        engine.load([player for row in board for player in row])
+        return engine
+
+    def load(self, cells):
+        """Đặt lại bàn cờ theo list size * size phần tử (X = 1, O = -1, trống = 0)"""
+        num_cells = self.size * self.size
+        self.cells = [0] * num_cells
+        self.near = [0] * num_cells
+        self.lines.reset()
+        self.hash = 0
+        for cell, player in enumerate(cells):
+            if player:
+                self.make(cell, player)
+        self.stack = []
+
+    def to_board(self):
+        """Bàn cờ dạng list N × N"""
+        return [self.cells[row * self.size:(row + 1) * self.size] for row in range(self.size)]
+
+    def coordinates(self, cell):
+        """Ô (hàng, cột) của chỉ số cell"""
+        return divmod(cell, self.size)
+
+    def make(self, cell, player):
+        """Đặt quân của player (1 hoặc -1) vào ô cell; True nếu nước này thắng"""
+        self.cells[cell] = player
+        self.stack.append(cell)
+        self.hash ^= self.zobrist[player][cell]
+        near = self.near
+        for neighbor in self.neighborhood[cell]:
+            near[neighbor] += 1
+        return self.lines.place(cell, player)
+
+    def unmake(self, cell):
+        """Gỡ quân ở ô cell (nước đi cuối cùng)"""
+        player = self.cells[cell]
+        self.lines.remove(cell, player)
+        self.hash ^= self.zobrist[player][cell]
+        self.cells[cell] = 0
+        self.stack.pop()
+        near = self.near
+        for neighbor in self.neighborhood[cell]:
+            near[neighbor] -= 1
+
+    def is_win(self, cell):
+        """True nếu quân ở ô cell nằm trong một chuỗi đủ win_length quân"""
+        cells = self.cells
+        player = cells[cell]
+        needed = self.win_length - 1
+        for forward, backward in self.rays[cell]:
+            count = 0
+            for other in forward:
+                if cells[other] != player:
+                    break
+                count += 1
+            for other in backward:
+                if cells[other] != player:
+                    break
+                count += 1
+            if count >= needed:
+                return True
+        return False
+
+    def winner(self):
+        """1 nếu X thắng, -1 nếu O thắng, 0 nếu chưa ai thắng (quét cả bàn cờ)"""
+        for cell, player in enumerate(self.cells):
+            if player and self.is_win(cell):
+                return player
+        return 0
+
+    def is_full(self):
+        return 0 not in self.cells
+
+    def is_terminal(self):
+        return self.winner() != 0 or self.is_full()
+
+    def candidates(self):
+        """Các ô trống gần quân đã có; bàn trống thì chỉ xét ô trung tâm"""
+        cells, near = self.cells, self.near
+        moves = [cell for cell in range(len(cells)) if not cells[cell] and near[cell]]
+        if not moves:
+            moves = [cell for cell in range(len(cells)) if not cells[cell]]
+            if len(moves) == len(cells):
+                moves = [min(moves, key=self.center_rank.__getitem__)]
+        return moves
+
+    def ordered_moves(self, ply, first=-1):
+        """Ứng viên theo thứ tự: nước first (nước tốt nhất trong bảng chuyển vị),
+        nước killer ở ply này, điểm history, gần tâm"""
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history, center_rank = self.history, self.center_rank
+        return sorted(self.candidates(),
+                      key=lambda cell: (cell != first, cell not in killers,
+                                        -history[cell], center_rank[cell]))
+
+    def evaluate(self):
+        """Đánh giá thế cờ chưa kết thúc theo các đoạn còn mở của mỗi bên (O(1),
+        số đếm đã được make/unmake cập nhật)"""
+        return self.lines.score
+
+    def search(self, depth, is_maximizing, alpha, beta, ply):
+        """Alpha-beta giới hạn depth nước; điểm theo góc nhìn của X"""
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() >= self.deadline:
+            raise SearchTimeout
+        if depth == 0:
+            return self.evaluate()
+
+        table = self.table
+        table_move = -1
+        if table is not None:
+            key = self.hash if is_maximizing else self.hash ^ self.side_key
+            entry = table.probe(key)
+            if entry is not None:
+                value, entry_depth, bound, table_move = entry
+                if entry_depth >= depth:
+                    value = from_table(value, ply)
+                    if bound == LOWER:
+                        alpha = max(alpha, value)
+                    elif bound == UPPER:
+                        beta = min(beta, value)
+                    if bound == EXACT or beta <= alpha:
+                        return value
+            alpha_start, beta_start = alpha, beta
+
+        moves = self.ordered_moves(ply, table_move)
+        if not moves:
+            return 0
+
+        player = 1 if is_maximizing else -1
+        best = -WIN_SCORE - 1 if is_maximizing else WIN_SCORE + 1
+        best_cell = moves[0]
+        for cell in moves:
+            if self.make(cell, player):
+                score = player * (WIN_SCORE - ply - 1)
+            else:
+                score = self.search(depth - 1, not is_maximizing, alpha, beta, ply + 1)
+            self.unmake(cell)
+            if is_maximizing:
+                if score > best:
+                    best, best_cell = score, cell
+                alpha = max(alpha, score)
+            else:
+                if score < best:
+                    best, best_cell = score, cell
+                beta = min(beta, score)
+            if beta <= alpha:
+                self.record_cutoff(cell, depth, ply)
+                break
+
+        if table is not None:
+            if best <= alpha_start:
+                bound = UPPER
+            elif best >= beta_start:
+                bound = LOWER
+            else:
+                bound = EXACT
+            table.store(key, to_table(best, ply), depth, bound, best_cell)
+        return best
+
+    def record_cutoff(self, cell, depth, ply):
+        """Ghi nhận nước gây cắt tỉa cho killer (theo ply) và history"""
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if cell not in killers:
+            killers.insert(0, cell)
+            del killers[2:]
+        self.history[cell] += depth * depth
+
+    def search_root(self, moves, depth, is_maximizing):
+        """Một vòng tìm kiếm ở gốc; trả về điểm của từng nước (nước không tốt nhất
+        có thể chỉ là cận do cửa sổ alpha-beta đã thu hẹp)"""
+        player = 1 if is_maximizing else -1
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        scores = {}
+        for cell in moves:
+            if self.make(cell, player):
+                score = player * WIN_SCORE
+            else:
+                score = self.search(depth - 1, not is_maximizing, alpha, beta, 1)
+            self.unmake(cell)
+            scores[cell] = score
+            if is_maximizing:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+        return scores
+
+    def best_move(self, is_maximizing, time_budget=1.0, max_depth=None):
+        """Nước đi tốt nhất bằng alpha-beta sâu dần trong time_budget giây
+
+        Mỗi vòng sâu thêm một nước và xét nước tốt nhất của vòng trước đầu tiên;
+        hết giờ giữa vòng thì dùng kết quả của vòng đã hoàn thành gần nhất.
+        Trả về (nước đi (hàng, cột), điểm, danh sách (nước đi, điểm)) như
+        BitboardTicTacToe.best_move; độ sâu đạt được ở self.completed_depth.
+        """
+        start = time.perf_counter()
+        self.deadline = start + time_budget
+        self.nodes = 0
+        self.completed_depth = 0
+        self.killers = []
+        self.history = [0] * len(self.cells)
+        root_depth = len(self.stack)
+
+        moves = self.ordered_moves(0)
+        if not moves:
+            return None, 0, []
+        empties = self.cells.count(0)
+        max_depth = empties if max_depth is None else min(max_depth, empties)
+        scores = {}
+        for depth in range(1, max_depth + 1):
+            try:
+                iteration = self.search_root(moves, depth, is_maximizing)
+            except SearchTimeout:
+                # Gỡ các nước còn dang dở trên bàn cờ
+                while len(self.stack) > root_depth:
+                    self.unmake(self.stack[-1])
+                break
+            scores = iteration
+            self.completed_depth = depth
+            moves.sort(key=scores.__getitem__, reverse=is_maximizing)
+            if abs(scores[moves[0]]) >= WIN_SCORE - max_depth:
+                break
+        if not scores:
+            # Chưa xong vòng nào: chọn nước đầu tiên theo thứ tự đã sắp
+            scores = {moves[0]: self.evaluate()}
+
+        best = moves[0]
+        moves_with_scores = [(self.coordinates(cell), scores[cell])
+                             for cell in sorted(scores)]
+        return self.coordinates(best), scores[best], moves_with_scores
+
+
+# Ví dụ sử dụng
+if __name__ == "__main__":
+    for size, win_length in ((9, 5), (15, 5)):
+        engine = CaroEngine(size, win_length)
+        player = 1
+        print(f"Tự chơi {size}×{size}, {win_length} quân liên tiếp, 1 giây mỗi nước:")
+        for turn in range(12):
+            start = time.perf_counter()
+            move, score, _ = engine.best_move(player == 1, time_budget=1.0)
+            elapsed = time.perf_counter() - start
+            cell = move[0] * size + move[1]
+            won = engine.make(cell, player)
+            print(f"  {'X' if player == 1 else 'O'} {move}: độ sâu {engine.completed_depth}, "
+                  f"{engine.nodes} nút, {elapsed:.2f}s, điểm {score}")
+            if won:
+                print("  Thắng!")
+                break
+            player = -player
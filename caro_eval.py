@@ -0,0 +1,135 @@
+import time
+
+# Bốn hướng của một đường: ngang, dọc, chéo xuống, chéo lên
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# Trọng số của một đoạn chỉ có count quân của một bên: tăng THREAT_BASE lần
+# với mỗi quân thêm vào, nên một đoạn thiếu một quân lấn át nhiều đoạn yếu hơn
+THREAT_BASE = 10
+
+
+def line_segments(size, win_length):
+    """Mọi đoạn win_length ô liên tiếp trên bàn size × size (mỗi đoạn là list chỉ số ô)"""
+    segments = []
+    for row in range(size):
+        for col in range(size):
+            for dr, dc in DIRECTIONS:
+                end_row, end_col = row + dr * (win_length - 1), col + dc * (win_length - 1)
+                if 0 <= end_row < size and 0 <= end_col < size:
+                    segments.append([(row + dr * step) * size + col + dc * step
+                                     for step in range(win_length)])
+    return segments
+
+
+class LineCounts:
+    def __init__(self, size, win_length, limit=None):
+        """
+        Đánh giá thế cờ theo số quân X và O trên từng đoạn thắng, cập nhật tăng dần
+        - size: kích thước bàn cờ
+        - win_length: số quân liên tiếp để thắng (độ dài mỗi đoạn)
+        - limit: giới hạn trị tuyệt đối của điểm (mặc định không giới hạn)
+        Mỗi đoạn lưu một mã x * (win_length + 1) + o. Đoạn chỉ có quân của một bên
+        được cộng (X) hoặc trừ (O) THREAT_BASE^(số quân - 1); đoạn có quân của cả
+        hai bên không còn giá trị. Đặt hoặc gỡ một quân chỉ cập nhật các đoạn đi
+        qua ô đó, tức O(số đoạn qua một ô) thay vì quét lại cả bàn cờ.
+        """
+        self.size = size
+        self.win_length = win_length
+        self.limit = limit
+        self.segments = line_segments(size, win_length)
+        self.cell_segments = [[] for _ in range(size * size)]
+        for index, segment in enumerate(self.segments):
+            for cell in segment:
+                self.cell_segments[cell].append(index)
+
+        stride = win_length + 1
+        # step[player]: thay đổi mã đoạn khi player đặt thêm một quân
+        self.step = {1: stride, -1: 1}
+        self.win_code = {1: win_length * stride, -1: win_length}
+        self.values = [0] * (stride * stride)
+        for x in range(win_length):
+            for o in range(win_length):
+                if x and not o:
+                    self.values[x * stride] = THREAT_BASE ** (x - 1)
+                elif o and not x:
+                    self.values[o] = -THREAT_BASE ** (o - 1)
+        self.reset()
+
+    def reset(self):
+        """Xóa mọi quân (bàn cờ trống)"""
+        self.codes = [0] * len(self.segments)
+        self.raw_score = 0
+
+    def place(self, cell, player):
+        """Cập nhật các đoạn qua ô cell khi player đặt quân; True nếu nước này
+        hoàn thành một đoạn (thắng)"""
+        codes, values = self.codes, self.values
+        step, win_code = self.step[player], self.win_code[player]
+        delta = 0
+        won = False
+        for index in self.cell_segments[cell]:
+            old = codes[index]
+            new = old + step
+            codes[index] = new
+            delta += values[new] - values[old]
+            if new == win_code:
+                won = True
+        self.raw_score += delta
+        return won
+
+    def remove(self, cell, player):
+        """Hoàn tác place(cell, player)"""
+        codes, values = self.codes, self.values
+        step = self.step[player]
+        delta = 0
+        for index in self.cell_segments[cell]:
+            old = codes[index]
+            new = old - step
+            codes[index] = new
+            delta += values[new] - values[old]
+        self.raw_score += delta
+
+    @property
+    def score(self):
+        """Điểm theo góc nhìn của X (dương có lợi cho X)"""
+        if self.limit is None:
+            return self.raw_score
+        return max(-self.limit, min(self.limit, self.raw_score))
+
+    def rescan(self, cells):
+        """Tính lại điểm từ đầu trên cả bàn cờ (để kiểm chứng bản tăng dần)"""
+        stride = self.win_length + 1
+        total = 0
+        for segment in self.segments:
+            x = sum(1 for cell in segment if cells[cell] == 1)
+            o = sum(1 for cell in segment if cells[cell] == -1)
+            if x < self.win_length and o < self.win_length:
+                total += self.values[x * stride + o]
+        return total
+
+
+# Ví dụ sử dụng
+if __name__ == "__main__":
+    import random
+
+    size, win_length = 15, 5
+    counts = LineCounts(size, win_length)
+    cells = [0] * (size * size)
+    print(f"{len(counts.segments)} đoạn, tối đa "
+          f"{max(map(len, counts.cell_segments))} đoạn qua một ô")
+
+    rng = random.Random(0)
+    order = rng.sample(range(size * size), 60)
+    incremental_time = rescan_time = 0.0
+    for ply, cell in enumerate(order):
+        player = 1 if ply % 2 == 0 else -1
+        cells[cell] = player
+        start = time.perf_counter()
+        counts.place(cell, player)
+        incremental_time += time.perf_counter() - start
+        start = time.perf_counter()
+        counts.rescan(cells)
+        rescan_time += time.perf_counter() - start
+    print(f"Sau {len(order)} nước: điểm {counts.score}; cập nhật tăng dần "
+          f"{incremental_time / len(order) * 1e6:.1f}µs/nước, quét lại "
+          f"{rescan_time / len(order) * 1e6:.1f}µs/nước")
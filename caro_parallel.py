@@ -0,0 +1,264 @@
+import multiprocessing
+import os
+import random
+import time
+
+from caro_engine import (WIN_SCORE, MATE_THRESHOLD, TABLE_GENERATIONS, CaroEngine, CaroTable,
+                         SearchTimeout)
+
+# Nửa độ rộng cửa sổ aspiration (một đoạn 3 quân = 100)
+ASPIRATION_WINDOW = 200
+
+# Trạng thái của mỗi tiến trình con (gán trong _init_worker)
+_engine = None
+_root_bound = None
+_search_id = None
+
+
+def _init_worker(size, win_length, radius, table, root_bound):
+    global _engine, _root_bound
+    _engine = CaroEngine(size, win_length, radius, table)
+    _root_bound = root_bound
+
+
+def _search_root_move(task):
+    """Tìm một nước ở gốc trong tiến trình con; trả về (ô, điểm hoặc None nếu hết
+    giờ, True nếu điểm chính xác (nằm trong cửa sổ), số nút)"""
+    global _search_id
+    cells, cell, depth, is_maximizing, alpha, beta, deadline, search_id, generation = task
+    if time.perf_counter() >= deadline:
+        return cell, None, False, 0
+    engine = _engine
+    engine.table.generation = generation
+    if search_id != _search_id:
+        # Lần tìm mới: bỏ killer/history của lần trước
+        _search_id = search_id
+        engine.killers = []
+        engine.history = [0] * len(engine.cells)
+    if engine.cells != cells:
+        engine.load(cells)
+    engine.deadline = deadline
+    engine.nodes = 0
+
+    # Cận gốc dùng chung: điểm tốt nhất (theo góc nhìn bên đi) đã tìm được ở gốc
+    player = 1 if is_maximizing else -1
+    bound = _root_bound.value
+    if is_maximizing:
+        alpha = max(alpha, bound)
+    else:
+        beta = min(beta, -bound)
+    if alpha >= beta:
+        # Cửa sổ rỗng: nước này không tốt hơn cận đã biết; không tìm, không ghi bảng
+        return cell, alpha if is_maximizing else beta, False, 0
+    try:
+        if engine.make(cell, player):
+            score = player * WIN_SCORE
+            exact = True
+        else:
+            score = engine.search(depth - 1, not is_maximizing, alpha, beta, 1)
+            exact = alpha < score < beta
+    except SearchTimeout:
+        score, exact = None, False
+    while engine.stack:
+        engine.unmake(engine.stack[-1])
+
+    # Chỉ chia sẻ điểm chính xác; điểm ngoài cửa sổ chỉ là cận của nước này
+    if exact:
+        with _root_bound.get_lock():
+            if player * score > _root_bound.value:
+                _root_bound.value = player * score
+    return cell, score, exact, engine.nodes
+
+
+class ParallelCaroSearch:
+    def __init__(self, size=15, win_length=5, workers=None, radius=2, table_bits=20):
+        """
+        Tìm kiếm song song kiểu chia gốc cho CaroEngine trên nhiều tiến trình
+        - size, win_length, radius: như CaroEngine
+        - workers: số tiến trình con (mặc định bằng số lõi CPU)
+        - table_bits: log2 số mục của bảng chuyển vị dùng chung
+        Mỗi vòng sâu dần tìm nước tốt nhất của vòng trước trước tiên, rồi chia các
+        nước còn lại cho các tiến trình con. Các tiến trình dùng chung bảng chuyển
+        vị (bộ nhớ dùng chung) và cận tốt nhất ở gốc, nên mỗi nước được tìm với
+        cửa sổ hẹp nhất đã biết. Cửa sổ ban đầu là aspiration quanh điểm của vòng
+        trước; nếu kết quả rơi ra ngoài thì tìm lại với cửa sổ đầy đủ, sau khi
+        chuyển bảng chuyển vị sang thế hệ mới (mục của lần tìm hẹp chỉ còn dùng để
+        sắp xếp nước đi).
+        """
+        self.size = size
+        self.win_length = win_length
+        self.workers = workers or os.cpu_count()
+        self.engine = CaroEngine(size, win_length, radius)
+        self.table = CaroTable(table_bits, shared=True)
+        self.root_bound = multiprocessing.Value('q', 0)
+        self.pool = multiprocessing.Pool(self.workers, _init_worker,
+                                         (size, win_length, radius, self.table, self.root_bound))
+        self.search_id = 0
+        self.generation = 0
+        self.nodes = 0
+        self.completed_depth = 0
+        self.researches = 0
+
+    def close(self):
+        """Dừng các tiến trình con"""
+        self.pool.terminate()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def search_iteration(self, cells, moves, depth, is_maximizing, alpha, beta, deadline):
+        """Một vòng ở gốc với cửa sổ (alpha, beta); trả về (điểm của từng nước, tập
+        các nước có điểm chính xác), None nếu hết giờ giữa vòng"""
+        self.root_bound.value = alpha if is_maximizing else -beta
+        tasks = [(cells, cell, depth, is_maximizing, alpha, beta, deadline, self.search_id,
+                  self.generation) for cell in moves]
+        # Nước đầu tiên (nước tốt nhất của vòng trước) tìm riêng để có cận tốt
+        # trước khi chia các nước còn lại
+        results = [self.pool.apply(_search_root_move, (tasks[0],))]
+        if results[0][1] is not None:
+            results += self.pool.imap_unordered(_search_root_move, tasks[1:])
+        self.nodes += sum(nodes for _, _, _, nodes in results)
+        if any(score is None for _, score, _, _ in results):
+            return None
+        return ({cell: score for cell, score, _, _ in results},
+                {cell for cell, _, exact, _ in results if exact})
+
+    def best_move(self, board, is_maximizing, time_budget=1.0, max_depth=None):
+        """Nước đi tốt nhất bằng tìm kiếm song song sâu dần trong time_budget giây
+
+        board là list N × N; kết quả giống CaroEngine.best_move.
+        """
+        start = time.perf_counter()
+        deadline = start + time_budget
+        self.search_id += 1
+        self.nodes = 0
+        self.completed_depth = 0
+        self.researches = 0
+
+        engine = self.engine
+        cells = [player for row in board for player in row]
+        engine.load(cells)
+        moves = engine.ordered_moves(0)
+        if not moves:
+            return None, 0, []
+        empties = cells.count(0)
+        max_depth = empties if max_depth is None else min(max_depth, empties)
+        full_window = (-WIN_SCORE - 1, WIN_SCORE + 1)
+        player = 1 if is_maximizing else -1
+        scores = {}
+        best_scores = []
+        for depth in range(1, max_depth + 1):
+            # Điểm dao động theo độ sâu chẵn/lẻ (bên đi nước cuối được lợi), nên
+            # cửa sổ đặt quanh điểm của vòng cùng tính chẵn lẻ trước đó
+            previous = best_scores[-2] if len(best_scores) >= 2 else None
+            if previous is not None and abs(previous) < MATE_THRESHOLD:
+                window = (previous - ASPIRATION_WINDOW, previous + ASPIRATION_WINDOW)
+            else:
+                window = full_window
+            iteration = self.search_iteration(cells, moves, depth, is_maximizing,
+                                              *window, deadline)
+            if iteration is not None and window != full_window:
+                best = max(player * score for score in iteration[0].values()) * player
+                if not window[0] < best < window[1]:
+                    # Aspiration thất bại: các mục ghi trong lần tìm hẹp không dùng để cắt tỉa nữa
+                    self.researches += 1
+                    self.generation = (self.generation + 1) % TABLE_GENERATIONS
+                    iteration = self.search_iteration(cells, moves, depth, is_maximizing,
+                                                      *full_window, deadline)
+            if iteration is None:
+                break
+            scores, exact = iteration
+            self.completed_depth = depth
+            # Cùng điểm thì nước có điểm chính xác đứng trước nước chỉ có cận trên
+            moves.sort(key=lambda cell: (player * scores[cell], cell in exact), reverse=True)
+            best_scores.append(scores[moves[0]])
+            if abs(scores[moves[0]]) >= WIN_SCORE - max_depth:
+                break
+        if not scores:
+            scores = {moves[0]: engine.evaluate()}
+
+        best = moves[0]
+        moves_with_scores = [(engine.coordinates(cell), scores[cell]) for cell in sorted(scores)]
+        return engine.coordinates(best), scores[best], moves_with_scores
+
+
+def benchmark_positions(size, win_length, count=3, opening=8, seed=0):
+    """Các thế cờ giữa ván để đo: tự chơi opening nước bằng tìm kiếm nông, bắt
+    đầu từ một nước ngẫu nhiên gần tâm"""
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(count):
+        engine = CaroEngine(size, win_length)
+        center = size // 2
+        engine.make((center + rng.randint(-1, 1)) * size + center + rng.randint(-1, 1), 1)
+        player = -1
+        for _ in range(opening - 1):
+            move, _, _ = engine.best_move(player == 1, float('inf'), max_depth=2)
+            engine.make(move[0] * size + move[1], player)
+            player = -player
+        positions.append((engine.to_board(), player == 1))
+    return positions
+
+
+def benchmark(size=15, win_length=5, depth=4, worker_counts=None, positions=3):
+    """Đo thời gian tìm kiếm độ sâu cố định theo số tiến trình
+
+    Mốc so sánh là CaroEngine tuần tự kèm CaroTable; cả hai bên dùng bảng chuyển
+    vị trống cho mỗi thế cờ. Ở độ sâu cố định điểm ở gốc không phụ thuộc thứ tự
+    tìm nên phải trùng với tuần tự; báo lỗi nếu khác. Nước đi có thể khác khi
+    nhiều nước cùng điểm. Trả về dict theo số tiến trình ('serial' cho mốc):
+    tổng thời gian, số nút, tỷ lệ thời gian tuần tự / song song và số thế cờ
+    chọn cùng nước với tuần tự.
+    """
+    if worker_counts is None:
+        cores = os.cpu_count()
+        worker_counts = sorted({count for count in (1, 2, 4, 8) if count <= cores} | {cores})
+    boards = benchmark_positions(size, win_length, positions)
+
+    start = time.perf_counter()
+    serial_results = []
+    serial_nodes = 0
+    for board, is_maximizing in boards:
+        engine = CaroEngine.from_board(board, win_length, table=CaroTable())
+        serial_results.append(engine.best_move(is_maximizing, float('inf'), depth)[:2])
+        serial_nodes += engine.nodes
+    serial_time = time.perf_counter() - start
+    results = {'serial': {'seconds': serial_time, 'nodes': serial_nodes,
+                          'time_ratio': 1.0, 'same_move': len(boards)}}
+
+    for workers in worker_counts:
+        with ParallelCaroSearch(size, win_length, workers) as search:
+            # Khởi động tiến trình con trước khi đo
+            search.best_move(boards[0][0], boards[0][1], float('inf'), 1)
+            elapsed = 0.0
+            nodes = same_move = 0
+            for (board, is_maximizing), (serial_move, serial_score) in zip(boards, serial_results):
+                search.table.clear()
+                start = time.perf_counter()
+                move, score, _ = search.best_move(board, is_maximizing, float('inf'), depth)
+                elapsed += time.perf_counter() - start
+                if score != serial_score:
+                    raise AssertionError(f"{workers} tiến trình cho điểm {score} ({move}), "
+                                         f"tuần tự cho {serial_score} ({serial_move})")
+                nodes += search.nodes
+                same_move += move == serial_move
+        results[workers] = {'seconds': elapsed, 'nodes': nodes,
+                            'time_ratio': serial_time / elapsed, 'same_move': same_move}
+    return results
+
+
+# Ví dụ sử dụng
+if __name__ == "__main__":
+    print(f"{os.cpu_count()} lõi CPU")
+    positions = 3
+    for size, depth in ((9, 4), (15, 4)):
+        results = benchmark(size, 5, depth, positions=positions)
+        print(f"Caro {size}×{size}, 5 quân, độ sâu {depth}:")
+        for name, row in results.items():
+            label = 'tuần tự' if name == 'serial' else f'{name} tiến trình'
+            print(f"  {label:<13} {row['seconds']:6.2f}s  {row['nodes']:>9} nút  "
+                  f"×{row['time_ratio']:.2f}  cùng nước {row['same_move']}/{positions}")
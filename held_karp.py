@@ -0,0 +1,64 @@
+import numpy as np
+
+# Số thành phố tối đa: bảng quy hoạch động có 2^(n-1) × (n-1) phần tử
+MAX_CITIES = 22
+
+
+def held_karp(distance_matrix):
+    """Giải chính xác TSP bằng quy hoạch động Held–Karp trên bitmask
+
+    Mỗi bước tính cùng lúc mọi tập con có cùng số phần tử kết thúc tại một
+    thành phố bằng NumPy. Hỗ trợ cả ma trận bất đối xứng. Lộ trình bắt đầu
+    tại thành phố 0. Trả về (lộ trình, độ dài).
+    """
+    matrix = np.asarray(distance_matrix, dtype=np.float64)
+    n = len(matrix)
+    if n > MAX_CITIES:
+        raise ValueError(f"Held–Karp chỉ dùng cho tối đa {MAX_CITIES} thành phố (có {n})")
+    if n <= 3:
+        route = list(range(n))
+        if n == 3 and (matrix[0, 2] + matrix[2, 1] + matrix[1, 0]
+                       < matrix[0, 1] + matrix[1, 2] + matrix[2, 0]):
+            route = [0, 2, 1]
+        length = sum(matrix[route[i - 1], route[i]] for i in range(n)) if n > 1 else 0.0
+        return route, float(length)
+
+    # Bit k của tập con ứng với thành phố k + 1 (thành phố 0 là điểm xuất phát)
+    m = n - 1
+    full = 1 << m
+    cost = matrix[1:, 1:]
+    dp = np.full((full, m), np.inf)
+    parent = np.full((full, m), -1, dtype=np.int8)
+    singles = 1 << np.arange(m)
+    dp[singles, np.arange(m)] = matrix[0, 1:]
+
+    subsets = np.arange(full)
+    popcount = np.zeros(full, dtype=np.int8)
+    for k in range(m):
+        popcount += (subsets >> k) & 1
+
+    for size in range(2, m + 1):
+        layer = subsets[popcount == size]
+        for k in range(m):
+            with_k = layer[(layer >> k) & 1 == 1]
+            previous = with_k ^ (1 << k)
+            # dp[previous, j] = inf khi j không thuộc previous nên không cần mặt nạ
+            candidates = dp[previous] + cost[:, k]
+            best = np.argmin(candidates, axis=1)
+            dp[with_k, k] = candidates[np.arange(len(with_k)), best]
+            parent[with_k, k] = best
+
+    closing = dp[full - 1] + matrix[1:, 0]
+    last = int(np.argmin(closing))
+    length = float(closing[last])
+
+    # Truy vết ngược từ tập đầy đủ
+    route = []
+    subset = full - 1
+    while last != -1:
+        route.append(last + 1)
+        previous = int(parent[subset, last])
+        subset ^= 1 << last
+        last = previous
+    route.append(0)
+    return route[::-1], length
@@ -1,41 +1,188 @@
 import random
 import math
+import os
+import time
+from collections import namedtuple
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from held_karp import MAX_CITIES, held_karp
+from tsp_checkpoint import CheckpointWriter, load_checkpoint
+from tsp_fitness_memo import FitnessMemo
+from tsp_local_search import LocalSearch
+from tsp_operators import MUTATION_MOVES, get_crossover, get_mutation
+from tsp_profiling import PhaseProfiler
+
+# Bản ghi gọn của một thế hệ do GeneticTSP.evolve_iter trả về
+GenerationRecord = namedtuple('GenerationRecord',
+                              ['generation', 'best', 'mean', 'best_route', 'elapsed'])
+
+# Chế độ tự thích nghi: cửa sổ đo tốc độ cải thiện (số thế hệ), ngưỡng đa dạng
+# (tỷ lệ độ dài khác nhau trong quần thể) và hệ số điều chỉnh mỗi thế hệ
+ADAPT_WINDOW = 10
+LOW_DIVERSITY = 0.5
+HIGH_DIVERSITY = 0.8
+STALL_IMPROVEMENT = 1e-3
+FAST_IMPROVEMENT = 1e-2
+# Trần cố định của tỷ lệ đột biến: đột biến cao giữ quần thể đa dạng nên lai ghép
+# sinh nhiều con mới phải đánh giá lại; trần thấp giữ số lượt đánh giá ngang
+# cấu hình tĩnh
+MAX_MUTATION_RATE = 0.1
 
 class GeneticTSP:
     def __init__(self, cities, population_size=100, generations=500, 
-                 mutation_rate=0.02, elite_size=20):
+                 mutation_rate=0.02, elite_size=20, dtype=np.float64,
+                 distance_matrix=None, seed=None, engine='list',
+                 crossover_operator='ox', mutation_operator='inversion',
+                 local_search=None, local_search_neighbors=8, crossover_rate=1.0,
+                 exact_threshold=16, fitness_cache_size=0, adaptive=False,
+                 min_population_size=None, profile=False, checkpoint_path=None,
+                 checkpoint_every=None, checkpoint_seconds=None):
         """
         Khởi tạo giải thuật di truyền cho TSP
         - cities: danh sách tọa độ thành phố [[x1,y1], [x2,y2], ...]
+          (có thể là None nếu truyền distance_matrix)
         - population_size: kích thước quần thể
         - generations: số thế hệ
         - mutation_rate: tỷ lệ đột biến
         - elite_size: số cá thể tốt nhất được giữ lại
+        - dtype: kiểu số của ma trận khoảng cách (np.float32 hoặc np.float64)
+        - distance_matrix: ma trận khoảng cách đã tính sẵn (bỏ qua bước tính lại),
+          có thể bất đối xứng (ví dụ thời gian di chuyển đường bộ), kiểu float32,
+          float64 hoặc uint32 (giây), và có thể là np.memmap từ DistanceMatrixCache
+        - seed: hạt giống cho luồng ngẫu nhiên riêng (None = dùng module random)
+        - engine: 'list' (quần thể là list Python) hoặc 'array' (mảng NumPy 2 chiều,
+          sinh cả thế hệ bằng các phép toán theo lô; chỉ có OX và đảo đoạn)
+        - crossover_operator: tên toán tử lai ghép ('ox', 'pmx', 'erx')
+        - mutation_operator: tên toán tử đột biến ('inversion', 'swap', 'insertion')
+        - local_search: None, 'elites' hoặc 'offspring' - áp dụng 2-opt/Or-opt
+          (giải thuật memetic) cho cá thể ưu tú hoặc cho mọi cá thể con
+        - local_search_neighbors: số láng giềng gần nhất xét trong tìm kiếm cục bộ
+        - crossover_rate: xác suất lai ghép; cá thể con không lai ghép là bản sao
+          của parent1 và dùng lại độ dài đã lưu của nó
+        - exact_threshold: dưới số thành phố này evolve giải chính xác bằng
+          Held–Karp thay vì chạy giải thuật di truyền (0 = luôn chạy GA; tối đa
+          MAX_CITIES + 1)
+        - fitness_cache_size: số lộ trình tối đa trong bộ nhớ đệm LRU độ dài dùng
+          chung qua các thế hệ, khóa theo dạng chuẩn của chu trình (0 = tắt).
+          Có lợi khi n lớn và quần thể đã hội tụ nhiều lộ trình trùng nhau
+        - adaptive: tự điều chỉnh tỷ lệ đột biến theo độ đa dạng của quần thể và
+          kích thước quần thể theo tốc độ cải thiện (thu nhỏ khi chững lại để
+          tiết kiệm lượt đánh giá, nới lại khi cải thiện nhanh)
+        - min_population_size: kích thước quần thể nhỏ nhất khi adaptive
+          (mặc định max(elite_size + 2, population_size // 4))
+        - profile: đo thời gian và số lần gọi theo pha (đánh giá, chọn lọc, lai
+          ghép, đột biến, ...) bằng perf_counter_ns; kết quả ở self.profiler.
+          Khi tắt, các phương thức không bị bọc nên không tốn thêm chi phí
+        - checkpoint_path: file checkpoint (.npz) được ghi định kỳ trong evolve;
+          tiếp tục bằng evolve(resume=checkpoint_path) với cùng tham số khởi tạo
+        - checkpoint_every: ghi checkpoint sau mỗi số thế hệ này
+        - checkpoint_seconds: ghi checkpoint khi đã qua số giây này từ lần ghi trước
         """
+        if cities is None and distance_matrix is None:
+            raise ValueError("Cần tọa độ thành phố hoặc ma trận khoảng cách")
         self.cities = cities
-        self.num_cities = len(cities)
+        self.num_cities = len(cities) if cities is not None else len(distance_matrix)
         self.population_size = population_size
         self.generations = generations
         self.mutation_rate = mutation_rate
         self.elite_size = elite_size
+        self.adaptive = adaptive
+        self.base_population_size = population_size
+        self.base_mutation_rate = mutation_rate
+        if min_population_size is None:
+            min_population_size = max(elite_size + 2, population_size // 4)
+        self.min_population_size = min(min_population_size, population_size)
+        self.mutation_rate_history = []
+        self.population_size_history = []
         self.best_fitness_history = []
         self.avg_fitness_history = []
+        self.evaluation_count = 0
+        self.evaluations_per_generation = []
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError("dtype phải là float32 hoặc float64")
+        if distance_matrix is None:
+            distance_matrix = self.build_distance_matrix()
+        else:
+            # Chấp nhận cả list lồng nhau; kiểu dữ liệu khác được chuyển sang float64
+            distance_matrix = np.asarray(distance_matrix)
+            if distance_matrix.dtype not in (np.float32, np.float64, np.uint32):
+                distance_matrix = distance_matrix.astype(np.float64)
+        if distance_matrix.shape != (self.num_cities, self.num_cities):
+            raise ValueError(f"Ma trận khoảng cách phải có kích thước "
+                             f"{self.num_cities} × {self.num_cities}")
+        self.distance_matrix = distance_matrix
+        self.rng = random.Random(seed) if seed is not None else random
+        if engine not in ('list', 'array'):
+            raise ValueError("engine phải là 'list' hoặc 'array'")
+        if engine == 'array' and (crossover_operator, mutation_operator) != ('ox', 'inversion'):
+            raise ValueError("engine='array' chỉ hỗ trợ crossover_operator='ox' và "
+                             "mutation_operator='inversion'")
+        self.engine = engine
+        self.np_rng = None
+        self.crossover_operator = get_crossover(crossover_operator)
+        self.mutation_operator = get_mutation(mutation_operator)
+        self.mutation_move = MUTATION_MOVES.get(mutation_operator)
+        self.crossover_rate = crossover_rate
+        # Cập nhật độ dài O(1) sau đột biến chỉ đúng với ma trận đối xứng
+        self.symmetric = bool(np.array_equal(self.distance_matrix, self.distance_matrix.T))
+        self.delta_evaluation_count = 0
+        self.stop_reason = None
+        if exact_threshold > MAX_CITIES + 1:
+            raise ValueError(f"exact_threshold tối đa là {MAX_CITIES + 1} "
+                             f"(Held–Karp chỉ giải được tới {MAX_CITIES} thành phố)")
+        self.exact_threshold = exact_threshold
+        if local_search not in (None, 'elites', 'offspring'):
+            raise ValueError("local_search phải là None, 'elites' hoặc 'offspring'")
+        self.local_search = local_search
+        self.local_searcher = None
+        if local_search is not None:
+            if not self.symmetric:
+                raise ValueError("Tìm kiếm cục bộ 2-opt/Or-opt chỉ dùng cho ma trận đối xứng")
+            # Tối ưu cục bộ theo đúng ma trận mà giải thuật dùng để chấm điểm
+            self.local_searcher = LocalSearch(k=local_search_neighbors,
+                                              distance_matrix=self.distance_matrix)
+        self.fitness_memo = None
+        if fitness_cache_size:
+            self.fitness_memo = FitnessMemo(fitness_cache_size, symmetric=self.symmetric)
+        # Mã băm của các lộ trình đã tối ưu cục bộ (bỏ qua khi gặp lại)
+        self._locally_optimal = set()
+        if checkpoint_path is not None and checkpoint_every is None and checkpoint_seconds is None:
+            raise ValueError("Cần checkpoint_every hoặc checkpoint_seconds khi có checkpoint_path")
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_seconds = checkpoint_seconds
+        self.profiler = None
+        if profile:
+            self.profiler = PhaseProfiler()
+            self.profiler.instrument(self)
         
+    def build_distance_matrix(self):
+        """Tính sẵn ma trận khoảng cách Euclidean giữa mọi cặp thành phố"""
+        coords = np.asarray(self.cities, dtype=np.float64).reshape(self.num_cities, 2)
+        diff = coords[:, None, :] - coords[None, :, :]
+        return np.sqrt((diff ** 2).sum(axis=2)).astype(self.dtype)
+    
     def calculate_distance(self, city1, city2):
         """Tính khoảng cách Euclidean giữa hai thành phố"""
         return math.sqrt((city1[0] - city2[0])**2 + (city1[1] - city2[1])**2)
     
     def calculate_route_distance(self, route):
         """Tính tổng khoảng cách của một lộ trình"""
-        distance = 0
-        for i in range(len(route)):
-            distance += self.calculate_distance(
-                self.cities[route[i]], 
-                self.cities[route[(i+1) % len(route)]]
-            )
-        return distance
+        self.evaluation_count += 1
+        route = np.asarray(route, dtype=np.intp)
+        return float(self.distance_matrix[route, np.roll(route, -1)].sum(dtype=np.float64))
+    
+    def calculate_population_distances(self, population):
+        """Tính khoảng cách của cả quần thể bằng một phép gather-and-sum
+        trên mảng chỉ số (số cá thể × số thành phố)"""
+        routes = np.asarray(population, dtype=np.intp)
+        self.evaluation_count += len(routes)
+        next_cities = np.roll(routes, -1, axis=1)
+        return self.distance_matrix[routes, next_cities].sum(axis=1, dtype=np.float64)
     
     def fitness(self, route):
         """Hàm fitness - ngược với khoảng cách (càng ngắn càng tốt)"""
@@ -46,90 +193,491 @@ class GeneticTSP:
         population = []
         for _ in range(self.population_size):
             route = list(range(self.num_cities))
-            random.shuffle(route)
+            self.rng.shuffle(route)
             population.append(route)
         return population
     
-    def selection(self, population):
-        """Lựa chọn cá thể cha mẹ bằng phương pháp Tournament Selection"""
-        tournament_size = 5
-        tournament1 = random.sample(population, min(tournament_size, len(population)))
-        tournament2 = random.sample(population, min(tournament_size, len(population)))
+    def selection(self, population, distances=None):
+        """Lựa chọn cá thể cha mẹ bằng phương pháp Tournament Selection
+        - distances: mảng khoảng cách đã tính của quần thể (tính lại nếu None)
+        """
+        if distances is None:
+            distances = self.calculate_population_distances(population)
+        index1, index2 = self.selection_indices(population, distances)
+        return population[index1], population[index2]
+    
+    def selection_indices(self, population, distances):
+        """Chỉ số của hai cha mẹ được chọn bằng Tournament Selection"""
+        tournament_size = min(5, len(population))
+        tournament1 = self.rng.sample(range(len(population)), tournament_size)
+        tournament2 = self.rng.sample(range(len(population)), tournament_size)
         
-        parent1 = min(tournament1, key=lambda x: self.calculate_route_distance(x))
-        parent2 = min(tournament2, key=lambda x: self.calculate_route_distance(x))
-        return parent1, parent2
+        index1 = min(tournament1, key=lambda i: distances[i])
+        index2 = min(tournament2, key=lambda i: distances[i])
+        return index1, index2
     
     def crossover(self, parent1, parent2):
-        """Lai ghép hai cha mẹ bằng Order Crossover (OX)"""
-        size = len(parent1)
-        start, end = sorted(random.sample(range(size), 2))
+        """Lai ghép hai cha mẹ bằng toán tử đã chọn (mặc định Order Crossover)"""
+        return self.crossover_operator(parent1, parent2, self.rng)
+    
+    def mutate(self, route):
+        """Đột biến bằng toán tử đã chọn (mặc định đảo ngược một đoạn ngẫu nhiên)"""
+        return self.mutate_cached(route, math.nan)[0]
+    
+    def mutate_cached(self, route, length):
+        """Đột biến và cập nhật độ dài đã lưu chỉ từ các cạnh bị bỏ/thêm
+
+        Trả về (route, length); length là NaN nếu không thể cập nhật O(1).
+        """
+        if self.rng.random() < self.mutation_rate:
+            if self.mutation_move is None:
+                return self.mutation_operator(route, self.rng), math.nan
+            apply, delta = self.mutation_move
+            i, j = self.rng.sample(range(len(route)), 2)
+            if self.symmetric and not math.isnan(length):
+                length += delta(route, i, j, self.distance_matrix)
+                self.delta_evaluation_count += 1
+            else:
+                length = math.nan
+            route = apply(route, i, j)
+        return route, length
+    
+    def score_population(self, population, lengths=None):
+        """Khoảng cách của quần thể, chỉ tính lại các lộ trình chưa có độ dài (NaN)"""
+        if lengths is None:
+            return self.evaluate_routes(population)
+        lengths = np.array(lengths, dtype=np.float64)
+        missing = np.flatnonzero(np.isnan(lengths))
+        if len(missing):
+            lengths[missing] = self.evaluate_routes([population[i] for i in missing])
+        return lengths
+    
+    def evaluate_routes(self, routes):
+        """Khoảng cách của các lộ trình, tra bộ nhớ đệm độ dài trước nếu được bật"""
+        if self.fitness_memo is None:
+            return self.calculate_population_distances(routes)
+        return self.fitness_memo.lookup(
+            routes, lambda indices: self.calculate_population_distances(
+                [routes[i] for i in indices]))
+    
+    def next_generation(self, population, distances):
+        """Tạo thế hệ mới từ quần thể và mảng khoảng cách đã tính của nó"""
+        return self.next_generation_cached(population, distances)[0]
+    
+    def next_generation_cached(self, population, distances):
+        """Tạo thế hệ mới kèm độ dài đã biết của từng cá thể (NaN nếu phải tính lại)"""
+        # Chọn lọc - giữ lại elite_size cá thể tốt nhất
+        ranked = np.argsort(distances, kind='stable')
+        elite_indices = ranked[:self.elite_size]
+        new_population = [population[i] for i in elite_indices]
+        lengths = [float(distances[i]) for i in elite_indices]
+        
+        # Tạo thế hệ mới
+        while len(new_population) < self.population_size:
+            index1, index2 = self.selection_indices(population, distances)
+            parent1, parent2 = population[index1], population[index2]
+            if self.crossover_rate < 1.0 and self.rng.random() >= self.crossover_rate:
+                child, length = list(parent1), float(distances[index1])
+            else:
+                child = self.crossover(parent1, parent2)
+                # Con trùng cha/mẹ thì dùng lại độ dài đã lưu
+                if child == parent1:
+                    length = float(distances[index1])
+                elif child == parent2:
+                    length = float(distances[index2])
+                else:
+                    length = math.nan
+            child, length = self.mutate_cached(child, length)
+            new_population.append(child)
+            lengths.append(length)
         
-        child = [-1] * size
-        child[start:end] = parent1[start:end]
+        if self.local_search is not None:
+            # Chỉ các lộ trình bị tối ưu cục bộ thay đổi mới phải tính lại độ dài
+            offset = 0 if self.local_search == 'elites' else self.elite_size
+            end = self.elite_size if self.local_search == 'elites' else len(new_population)
+            for index in self.apply_local_search(new_population[offset:end]):
+                lengths[offset + index] = math.nan
+        return new_population, np.array(lengths, dtype=np.float64)
+    
+    def apply_local_search(self, routes):
+        """Tối ưu cục bộ 2-opt/Or-opt tại chỗ cho các lộ trình chưa tối ưu
+
+        Trả về chỉ số (trong routes) của các lộ trình đã bị thay đổi.
+        """
+        optimal = set()
+        changed = []
+        for index, route in enumerate(routes):
+            key = hash(tuple(route))
+            if key not in self._locally_optimal:
+                self.local_searcher.optimize(route)
+                new_key = hash(tuple(route))
+                if new_key != key:
+                    changed.append(index)
+                key = new_key
+            optimal.add(key)
+        self._locally_optimal = optimal
+        return changed
+    
+    def create_population_array(self):
+        """Tạo quần thể ngẫu nhiên dạng mảng (số cá thể × số thành phố)"""
+        keys = self.np_rng.random((self.population_size, self.num_cities))
+        return np.argsort(keys, axis=1).astype(np.int32)
+    
+    def selection_batch(self, distances, count, tournament_size=5):
+        """Tournament Selection theo lô: argmin trên ma trận chỉ số ngẫu nhiên"""
+        candidates = self.np_rng.integers(0, len(distances), (count, tournament_size))
+        winners = np.argmin(distances[candidates], axis=1)
+        return candidates[np.arange(count), winners]
+    
+    def crossover_batch(self, parents1, parents2):
+        """Order Crossover (OX) cho cả lô cha mẹ cùng lúc"""
+        count, size = parents1.shape
+        rows = np.arange(count)[:, None]
+        positions = np.arange(size)
+        cuts = np.sort(np.argsort(self.np_rng.random((count, size)), axis=1)[:, :2], axis=1)
+        start, end = cuts[:, :1], cuts[:, 1:]
         
-        pointer = end
-        for city in parent2[end:] + parent2[:end]:
-            if city not in child:
-                if pointer >= size:
-                    pointer = 0
-                child[pointer] = city
-                pointer += 1
+        # Giữ đoạn [start, end) của parent1
+        in_segment = (positions >= start) & (positions < end)
+        children = np.where(in_segment, parents1, -1)
+        taken = np.zeros((count, size), dtype=bool)
+        taken[rows, parents1] = in_segment
         
-        return child
+        # Điền các thành phố còn lại theo thứ tự của parent2, bắt đầu từ end
+        rotation = (end + positions) % size
+        parent2_rotated = parents2[rows, rotation]
+        keep = ~taken[rows, parent2_rotated]
+        free = ~in_segment[rows, rotation]
+        children[np.nonzero(free)[0], rotation[free]] = parent2_rotated[keep]
+        return children
     
-    def mutate(self, route):
-        """Đột biến bằng cách đảo ngược một đoạn ngẫu nhiên"""
-        if random.random() < self.mutation_rate:
-            start, end = sorted(random.sample(range(len(route)), 2))
-            route[start:end+1] = reversed(route[start:end+1])
-        return route
-    
-    def evolve(self):
-        """Chạy giải thuật di truyền"""
-        population = self.create_population()
-        
-        for generation in range(self.generations):
-            # Tính fitness cho tất cả cá thể
-            fitness_scores = [self.fitness(route) for route in population]
-            
-            # Ghi lại thông tin quần thể
-            distances = [self.calculate_route_distance(route) for route in population]
-            self.best_fitness_history.append(min(distances))
-            self.avg_fitness_history.append(np.mean(distances))
-            
-            # Chọn lọc - giữ lại elite_size cá thể tốt nhất
-            ranked = sorted(zip(population, distances), key=lambda x: x[1])
-            elite_population = [route for route, _ in ranked[:self.elite_size]]
-            
-            # Tạo thế hệ mới
-            new_population = elite_population.copy()
-            while len(new_population) < self.population_size:
-                parent1, parent2 = self.selection(population)
-                child = self.crossover(parent1, parent2)
-                child = self.mutate(child)
-                new_population.append(child)
-            
-            population = new_population
-            
-            if (generation + 1) % 100 == 0:
-                best_distance = min(distances)
-                print(f"Thế hệ {generation + 1}: Khoảng cách tốt nhất = {best_distance:.2f}")
-        
-        # Tìm lộ trình tốt nhất cuối cùng
-        best_route = min(population, key=self.calculate_route_distance)
-        best_distance = self.calculate_route_distance(best_route)
+    def mutate_batch(self, routes):
+        """Đột biến đảo đoạn theo lô (mỗi cá thể với xác suất mutation_rate)"""
+        count, size = routes.shape
+        mutated = np.nonzero(self.np_rng.random(count) < self.mutation_rate)[0]
+        if len(mutated) == 0:
+            return routes
+        cuts = np.sort(np.argsort(self.np_rng.random((len(mutated), size)), axis=1)[:, :2], axis=1)
+        start, end = cuts[:, :1], cuts[:, 1:]
+        positions = np.arange(size)
+        source = np.where((positions >= start) & (positions <= end),
+                          start + end - positions, positions)
+        routes[mutated] = routes[mutated[:, None], source]
+        return routes
+    
+    def next_generation_array(self, population, distances):
+        """Tạo cả thế hệ mới dạng mảng bằng các phép toán theo lô"""
+        ranked = np.argsort(distances, kind='stable')
+        elites = population[ranked[:self.elite_size]]
+        count = self.population_size - len(elites)
+        parents1 = population[self.selection_batch(distances, count)]
+        parents2 = population[self.selection_batch(distances, count)]
+        children = self.mutate_batch(self.crossover_batch(parents1, parents2))
+        if self.local_search is not None:
+            improved = elites if self.local_search == 'elites' else children
+            routes = improved.tolist()
+            self.apply_local_search(routes)
+            improved[:] = routes
+        return np.concatenate([elites, children])
+    
+    def adapt(self, distances, best_history, generation):
+        """Điều chỉnh mutation_rate và population_size cho thế hệ kế tiếp
+
+        - Độ đa dạng (tỷ lệ độ dài khác nhau) thấp: tăng đột biến (không quá
+          MAX_MUTATION_RATE); cao: giảm dần về giá trị ban đầu
+        - Cải thiện tương đối của lộ trình tốt nhất trong ADAPT_WINDOW thế hệ
+          gần nhất nhỏ: thu nhỏ quần thể 10%; lớn: nới lại về kích thước ban đầu
+        """
+        diversity = len(np.unique(distances)) / len(distances)
+        if diversity < LOW_DIVERSITY:
+            self.mutation_rate = min(MAX_MUTATION_RATE, self.mutation_rate * 1.5)
+        elif diversity > HIGH_DIVERSITY:
+            self.mutation_rate = max(self.base_mutation_rate, self.mutation_rate * 0.8)
+        
+        if generation < ADAPT_WINDOW:
+            return
+        previous = best_history[generation - ADAPT_WINDOW]
+        improvement = (previous - best_history[generation]) / previous if previous > 0 else 0.0
+        if improvement < STALL_IMPROVEMENT:
+            self.population_size = max(self.min_population_size,
+                                       int(self.population_size * 0.9))
+        elif improvement > FAST_IMPROVEMENT:
+            self.population_size = min(self.base_population_size,
+                                       int(self.population_size * 1.1) + 1)
+    
+    def stop_criterion(self, elapsed, best_distance, stall, time_limit=None,
+                       target_distance=None, stall_generations=None):
+        """Tên tiêu chí dừng đã đạt (None nếu tiếp tục chạy)"""
+        if target_distance is not None and best_distance <= target_distance:
+            return 'target_distance'
+        if stall_generations is not None and stall >= stall_generations:
+            return 'stall'
+        if time_limit is not None and elapsed >= time_limit:
+            return 'time_limit'
+        return None
+    
+    def solve_exact(self, start_time=None):
+        """Giải chính xác bằng Held–Karp, trả về bản ghi của một "thế hệ" duy nhất"""
+        start_time = time.perf_counter() if start_time is None else start_time
+        route, distance = held_karp(self.distance_matrix)
+        self.evaluation_count += 1
+        self.best_fitness_history = np.array([distance])
+        self.avg_fitness_history = np.array([distance])
+        self.evaluations_per_generation = np.array([1], dtype=np.int64)
+        self.stop_reason = 'exact'
+        return GenerationRecord(1, distance, distance, route, time.perf_counter() - start_time)
+    
+    def checkpoint_state(self, population, lengths, generation, best_distance, best_route,
+                         stall, elapsed):
+        """Chụp trạng thái sau khi đã sinh quần thể cho thế hệ generation + 1
+
+        Trả về (dict các mảng, siêu dữ liệu) cho save_checkpoint. Các mảng lịch
+        sử là view của phần đã ghi xong nên không cần sao chép.
+        """
+        rng_version, rng_internal, rng_gauss = self.rng.getstate()
+        arrays = {
+            'population': np.array(population, dtype=np.int32),
+            'lengths': np.array(lengths if lengths is not None else [], dtype=np.float64),
+            'best_route': np.array(best_route, dtype=np.int32),
+            'rng_internal': np.array(rng_internal, dtype=np.uint32),
+            'locally_optimal': np.array(sorted(self._locally_optimal), dtype=np.int64),
+            'best_history': self.best_fitness_history,
+            'avg_history': self.avg_fitness_history,
+            'evaluation_history': self.evaluations_per_generation,
+            'mutation_history': self.mutation_rate_history,
+            'size_history': self.population_size_history,
+        }
+        meta = {
+            'num_cities': self.num_cities,
+            'engine': self.engine,
+            'generation': generation,
+            'has_lengths': lengths is not None,
+            'best_distance': best_distance,
+            'stall': stall,
+            'elapsed': elapsed,
+            'evaluation_count': self.evaluation_count,
+            'delta_evaluation_count': self.delta_evaluation_count,
+            'mutation_rate': self.mutation_rate,
+            'population_size': self.population_size,
+            'rng_version': rng_version,
+            'rng_gauss': rng_gauss,
+            'np_rng_state': self.np_rng.bit_generator.state if self.np_rng is not None else None,
+        }
+        if self.fitness_memo is not None:
+            arrays['memo_keys'], arrays['memo_lengths'] = self.fitness_memo.to_arrays()
+            meta['memo_hits'] = self.fitness_memo.hits
+            meta['memo_misses'] = self.fitness_memo.misses
+        return arrays, meta
+    
+    def restore_checkpoint(self, arrays, meta):
+        """Khôi phục trạng thái ngẫu nhiên, bộ đếm và bộ nhớ đệm từ checkpoint"""
+        if meta['num_cities'] != self.num_cities or meta['engine'] != self.engine:
+            raise ValueError("Checkpoint không khớp số thành phố hoặc engine")
+        if meta['generation'] > self.generations:
+            raise ValueError(f"Checkpoint đã chạy {meta['generation']} thế hệ, "
+                             f"vượt quá generations={self.generations}")
+        self.rng.setstate((meta['rng_version'], tuple(arrays['rng_internal'].tolist()),
+                           meta['rng_gauss']))
+        if meta['np_rng_state'] is not None:
+            self.np_rng = np.random.default_rng()
+            self.np_rng.bit_generator.state = meta['np_rng_state']
+        self.evaluation_count = meta['evaluation_count']
+        self.delta_evaluation_count = meta['delta_evaluation_count']
+        self.mutation_rate = meta['mutation_rate']
+        self.population_size = meta['population_size']
+        self._locally_optimal = set(arrays['locally_optimal'].tolist())
+        if self.fitness_memo is not None and 'memo_keys' in arrays:
+            self.fitness_memo.load_arrays(arrays['memo_keys'], arrays['memo_lengths'],
+                                          meta['memo_hits'], meta['memo_misses'])
+    
+    def evolve_iter(self, time_limit=None, target_distance=None, stall_generations=None,
+                    every=1, resume=None):
+        """Chạy giải thuật di truyền dạng generator, trả về GenerationRecord
+        - time_limit, target_distance, stall_generations: tiêu chí dừng như evolve
+        - every: chỉ trả về mỗi every thế hệ; thế hệ có lộ trình tốt hơn và
+          thế hệ cuối luôn được trả về
+        - resume: đường dẫn checkpoint để chạy tiếp; kết quả trùng khớp từng bit
+          với lần chạy không bị gián đoạn
+        Bản ghi chỉ mang lộ trình tốt nhất khi nó vừa được cải thiện (còn lại
+        best_route là None); khi tiếp tục, bản ghi đầu tiên là trạng thái tại
+        checkpoint và luôn mang lộ trình tốt nhất đã có.
+        Lịch sử được ghi vào mảng NumPy cấp phát trước.
+        """
+        if every < 1:
+            raise ValueError("every phải lớn hơn hoặc bằng 1")
+        start_time = time.perf_counter()
+        if self.adaptive:
+            self.population_size = self.base_population_size
+            self.mutation_rate = self.base_mutation_rate
+        if self.num_cities < self.exact_threshold:
+            yield self.solve_exact(start_time)
+            return
+        
+        best_history = np.empty(self.generations, dtype=np.float64)
+        avg_history = np.empty(self.generations, dtype=np.float64)
+        evaluation_history = np.zeros(self.generations, dtype=np.int64)
+        mutation_history = np.empty(self.generations, dtype=np.float64)
+        size_history = np.empty(self.generations, dtype=np.int64)
+        self.stop_reason = 'generations'
         
+        if resume is not None:
+            arrays, meta = load_checkpoint(resume)
+            self.restore_checkpoint(arrays, meta)
+            population = arrays['population']
+            if self.engine == 'list':
+                population = population.tolist()
+            lengths = arrays['lengths'] if meta['has_lengths'] else None
+            best_distance = meta['best_distance']
+            best_route = arrays['best_route'].tolist()
+            stall = meta['stall']
+            first_generation = meta['generation']
+            start_time -= meta['elapsed']
+            for history, name in ((best_history, 'best_history'), (avg_history, 'avg_history'),
+                                  (evaluation_history, 'evaluation_history'),
+                                  (mutation_history, 'mutation_history'),
+                                  (size_history, 'size_history')):
+                history[:first_generation] = arrays[name]
+            self.best_fitness_history = best_history[:first_generation]
+            self.avg_fitness_history = avg_history[:first_generation]
+            self.evaluations_per_generation = evaluation_history[:first_generation]
+            self.mutation_rate_history = mutation_history[:first_generation]
+            self.population_size_history = size_history[:first_generation]
+        else:
+            if self.engine == 'array':
+                if self.np_rng is None:
+                    self.np_rng = np.random.default_rng(self.rng.getrandbits(64))
+                population = self.create_population_array()
+            else:
+                population = self.create_population()
+            lengths = None
+            best_distance = math.inf
+            best_route = None
+            stall = 0
+            first_generation = 0
+        
+        # Checkpoint được chụp trong vòng lặp và ghi trên luồng nền
+        writer = None
+        if self.checkpoint_path is not None:
+            writer = CheckpointWriter(self.checkpoint_path, self.checkpoint_every,
+                                      self.checkpoint_seconds)
+        try:
+            if resume is not None:
+                # Bản ghi đầu tiên là trạng thái tại checkpoint, mang lộ trình tốt nhất đã có
+                yield GenerationRecord(first_generation, best_distance,
+                                       float(avg_history[first_generation - 1]), best_route,
+                                       meta['elapsed'])
+            for generation in range(first_generation, self.generations):
+                evaluations_before = self.evaluation_count
+                
+                # Tính khoảng cách - chỉ cho cá thể chưa có độ dài đã lưu
+                distances = self.score_population(population, lengths)
+                
+                # Ghi lại thông tin quần thể
+                best_index = int(np.argmin(distances))
+                best_history[generation] = distances[best_index]
+                avg_history[generation] = np.mean(distances)
+                improved_route = None
+                if distances[best_index] < best_distance:
+                    improved_route = np.asarray(population[best_index]).tolist()
+                    best_route = improved_route
+                    best_distance = float(distances[best_index])
+                    stall = 0
+                else:
+                    stall += 1
+                
+                elapsed = time.perf_counter() - start_time
+                reason = self.stop_criterion(elapsed, best_distance, stall, time_limit,
+                                             target_distance, stall_generations)
+                if reason is not None:
+                    self.stop_reason = reason
+                last = reason is not None or generation == self.generations - 1
+                
+                mutation_history[generation] = self.mutation_rate
+                size_history[generation] = len(distances)
+                
+                # Thế hệ cuối không cần sinh quần thể mới
+                if not last:
+                    if self.adaptive:
+                        self.adapt(distances, best_history, generation)
+                    if self.engine == 'array':
+                        population = self.next_generation_array(population, distances)
+                    else:
+                        population, lengths = self.next_generation_cached(population, distances)
+                evaluation_history[generation] = self.evaluation_count - evaluations_before
+                
+                self.best_fitness_history = best_history[:generation + 1]
+                self.avg_fitness_history = avg_history[:generation + 1]
+                self.evaluations_per_generation = evaluation_history[:generation + 1]
+                self.mutation_rate_history = mutation_history[:generation + 1]
+                self.population_size_history = size_history[:generation + 1]
+                
+                if writer is not None and not last and writer.due(generation + 1):
+                    writer.submit(*self.checkpoint_state(population, lengths, generation + 1,
+                                                         best_distance, best_route, stall,
+                                                         elapsed))
+                
+                if improved_route is not None or last or (generation + 1) % every == 0:
+                    yield GenerationRecord(generation + 1, float(best_history[generation]),
+                                           float(avg_history[generation]), improved_route, elapsed)
+                if last:
+                    break
+        finally:
+            if writer is not None:
+                writer.close()
+    
+    def evolve(self, time_limit=None, target_distance=None, stall_generations=None,
+               verbose=True, resume=None):
+        """Chạy giải thuật di truyền
+        - time_limit: thời gian chạy tối đa (giây)
+        - target_distance: dừng khi tìm được lộ trình không dài hơn giá trị này
+        - stall_generations: dừng khi khoảng cách tốt nhất không cải thiện
+          sau số thế hệ này
+        - verbose: in khoảng cách tốt nhất sau mỗi 100 thế hệ
+        - resume: đường dẫn checkpoint để chạy tiếp (xem evolve_iter)
+        Trả về lộ trình tốt nhất tìm được và khoảng cách của nó; tiêu chí đã
+        dừng vòng lặp được ghi vào self.stop_reason.
+        """
+        best_route, best_distance = None, math.inf
+        for record in self.evolve_iter(time_limit, target_distance, stall_generations,
+                                       resume=resume):
+            if record.best_route is not None:
+                best_route, best_distance = record.best_route, record.best
+            if verbose and record.generation % 100 == 0:
+                print(f"Thế hệ {record.generation}: Khoảng cách tốt nhất = {best_distance:.2f}")
         return best_route, best_distance
     
-    def visualize(self, route, title="Lộ trình TSP"):
-        """Hiển thị lộ trình tốt nhất"""
-        fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    def create_figure(self, show=True):
+        """Tạo hình gồm hai trục (lộ trình, sự hội tụ)
+
+        show=False dùng canvas Agg riêng, không cần màn hình hay backend pyplot.
+        """
+        if show:
+            fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+        else:
+            fig = Figure(figsize=(14, 5))
+            FigureCanvasAgg(fig)
+            axes = fig.subplots(1, 2)
+        return fig, axes
+    
+    def route_coordinates(self, route):
+        """Tọa độ các điểm của lộ trình khép kín (quay lại thành phố đầu)"""
+        if self.cities is None:
+            raise ValueError("Cần tọa độ thành phố để vẽ lộ trình")
+        coords = np.asarray(self.cities, dtype=np.float64).reshape(self.num_cities, 2)
+        route = np.asarray(route, dtype=np.intp)
+        return coords[np.append(route, route[:1])]
+    
+    def visualize(self, route, title="Lộ trình TSP", save_path=None, show=True):
+        """Hiển thị lộ trình tốt nhất
+        - save_path: ghi hình ra file (định dạng theo phần mở rộng, ví dụ .png, .svg)
+        - show: False để chạy không màn hình (chỉ ghi file), dùng khi render hàng loạt
+        Trả về đối tượng Figure.
+        """
+        fig, axes = self.create_figure(show)
         
         # Vẽ lộ trình
         ax = axes[0]
-        route_cities = [self.cities[i] for i in route] + [self.cities[route[0]]]
-        route_array = np.array(route_cities)
+        route_array = self.route_coordinates(route)
         ax.plot(route_array[:, 0], route_array[:, 1], 'b-', linewidth=1.5, alpha=0.6)
         ax.scatter(route_array[:, 0], route_array[:, 1], c='red', s=200, zorder=5, edgecolors='darkred', linewidth=2)
         
@@ -153,8 +701,108 @@ class GeneticTSP:
         ax.legend()
         ax.grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        plt.show()
+        fig.tight_layout()
+        if save_path is not None:
+            fig.savefig(save_path)
+        if show:
+            plt.show()
+        return fig
+    
+    def animate(self, time_limit=None, target_distance=None, stall_generations=None,
+                max_fps=20, show=True, frames_dir=None, save_path=None,
+                title="Lộ trình TSP"):
+        """Chạy giải thuật và vẽ trực tiếp lộ trình tốt nhất cùng đường hội tụ
+        - time_limit, target_distance, stall_generations: tiêu chí dừng như evolve
+        - max_fps: số khung hình tối đa mỗi giây; các thế hệ giữa hai khung bị bỏ
+          qua khi vẽ, khung cuối luôn được vẽ
+        - show: True vẽ lên cửa sổ bằng blitting (chỉ vẽ lại đường lộ trình, hai
+          đường hội tụ và dòng trạng thái trên nền đã lưu); False chạy không màn hình
+        - frames_dir: ghi mỗi khung thành frame_00001.png, ... vào thư mục này
+        - save_path: ghi khung cuối ra file (.png, .svg, ...)
+        Trả về lộ trình tốt nhất tìm được và khoảng cách của nó.
+        """
+        coords = self.route_coordinates(range(self.num_cities))
+        fig, (route_ax, curve_ax) = self.create_figure(show)
+        
+        # Phần tĩnh: vẽ một lần và lưu làm nền
+        route_ax.scatter(coords[:, 0], coords[:, 1], c='red', s=40, zorder=5,
+                         edgecolors='darkred')
+        route_ax.set_title(title, fontsize=12)
+        route_ax.set_xlabel('X')
+        route_ax.set_ylabel('Y')
+        route_ax.grid(True, alpha=0.3)
+        curve_ax.set_xlim(1, max(2, self.generations))
+        curve_ax.set_xlabel('Thế hệ')
+        curve_ax.set_ylabel('Khoảng cách')
+        curve_ax.set_title('Sự hội tụ của giải thuật')
+        curve_ax.grid(True, alpha=0.3)
+        
+        # Phần động: chỉ các artist này được vẽ lại ở mỗi khung
+        route_line, = route_ax.plot([], [], 'b-', linewidth=1.5, alpha=0.6)
+        status = route_ax.text(0.02, 0.98, '', transform=route_ax.transAxes, va='top',
+                               fontsize=10, bbox=dict(facecolor='white', alpha=0.8))
+        best_line, = curve_ax.plot([], [], label='Khoảng cách tốt nhất', linewidth=2)
+        avg_line, = curve_ax.plot([], [], label='Khoảng cách trung bình',
+                                  linewidth=2, alpha=0.7)
+        curve_ax.legend(loc='upper right')
+        artists = (route_line, status, best_line, avg_line)
+        for artist in artists:
+            artist.set_animated(show)
+        fig.tight_layout()
+        if show:
+            plt.show(block=False)
+        if frames_dir is not None:
+            os.makedirs(frames_dir, exist_ok=True)
+        
+        background = None
+        frame_count = 0
+        min_interval = 1.0 / max_fps
+        last_frame = -math.inf
+        best_route, best_distance = None, math.inf
+        
+        def draw_frame(record):
+            nonlocal background, frame_count
+            generations = np.arange(1, len(self.best_fitness_history) + 1)
+            best_line.set_data(generations, self.best_fitness_history)
+            avg_line.set_data(generations, self.avg_fitness_history)
+            status.set_text(f'Thế hệ {record.generation}: {best_distance:.2f}')
+            if frame_count == 0:
+                # Trục y cố định theo thế hệ đầu để nền đã lưu luôn hợp lệ
+                curve_ax.set_ylim(0, self.avg_fitness_history[0] * 1.05)
+                if show:
+                    fig.canvas.draw()
+                    background = fig.canvas.copy_from_bbox(fig.bbox)
+            if show:
+                fig.canvas.restore_region(background)
+                for artist in artists:
+                    fig.draw_artist(artist)
+                fig.canvas.blit(fig.bbox)
+                fig.canvas.flush_events()
+            frame_count += 1
+            if frames_dir is not None:
+                fig.savefig(os.path.join(frames_dir, f'frame_{frame_count:05d}.png'))
+        
+        record = None
+        for record in self.evolve_iter(time_limit, target_distance, stall_generations):
+            if record.best_route is not None:
+                best_route, best_distance = record.best_route, record.best
+                route_array = self.route_coordinates(best_route)
+                route_line.set_data(route_array[:, 0], route_array[:, 1])
+            now = time.perf_counter()
+            if now - last_frame >= min_interval:
+                draw_frame(record)
+                last_frame = now
+        if record is not None and last_frame != now:
+            draw_frame(record)
+        
+        # Khung cuối: vẽ lại toàn bộ với các artist động để ghi file/hiển thị
+        for artist in artists:
+            artist.set_animated(False)
+        if save_path is not None:
+            fig.savefig(save_path)
+        if show:
+            plt.show()
+        return best_route, best_distance
 
 
 # Ví dụ sử dụng
@@ -0,0 +1,29 @@
+import random
+
+from caro_eval import LineCounts
+
+
+def test_incremental_matches_rescan():
+    """Điểm cập nhật tăng dần khớp với quét lại cả bàn sau mỗi nước, và gỡ hết
+    quân thì trở về bàn trống"""
+    rng = random.Random(0)
+    for size, win_length in ((3, 3), (9, 5), (15, 5)):
+        counts = LineCounts(size, win_length)
+        cells = [0] * (size * size)
+        order = rng.sample(range(size * size), min(60, size * size))
+        for ply, cell in enumerate(order):
+            player = 1 if ply % 2 == 0 else -1
+            cells[cell] = player
+            counts.place(cell, player)
+            assert counts.raw_score == counts.rescan(cells), (size, ply)
+        for cell in reversed(order):
+            counts.remove(cell, cells[cell])
+            cells[cell] = 0
+            assert counts.raw_score == counts.rescan(cells), (size, cell)
+        assert not any(counts.codes)
+
+
+def test_place_reports_win():
+    counts = LineCounts(9, 5)
+    assert not any(counts.place(cell, 1) for cell in range(4))
+    assert counts.place(4, 1)
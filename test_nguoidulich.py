@@ -0,0 +1,58 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from nguoidulich import GeneticTSP
+
+
+def random_cities(num_cities, seed):
+    rng = random.Random(seed)
+    return [[rng.uniform(0, 100), rng.uniform(0, 100)] for _ in range(num_cities)]
+
+
+def test_adaptive_evaluation_budget():
+    """Chế độ adaptive không dùng nhiều lượt đánh giá hơn cấu hình tĩnh quá 20%
+    (tổng trên cùng các hạt giống; với trần đột biến 0.5 trước đây là khoảng ×1.5)"""
+    totals = {False: 0, True: 0}
+    for seed in range(3):
+        cities = random_cities(40, seed)
+        for adaptive in (False, True):
+            ga = GeneticTSP(cities, population_size=100, generations=300, seed=seed,
+                            adaptive=adaptive, exact_threshold=0)
+            ga.evolve(verbose=False)
+            totals[adaptive] += ga.evaluation_count
+    assert totals[True] <= 1.2 * totals[False], totals
+
+
+def test_nested_list_distance_matrix():
+    """Ma trận khoảng cách dạng list lồng nhau (số thực và số nguyên) được chuyển
+    sang mảng NumPy và dùng đúng khi chấm điểm lộ trình"""
+    cities = random_cities(20, 0)
+    for matrix in ([[math.dist(a, b) for b in cities] for a in cities],
+                   [[round(math.dist(a, b)) for b in cities] for a in cities]):
+        ga = GeneticTSP(None, population_size=20, generations=5, seed=0,
+                        distance_matrix=matrix)
+        assert isinstance(ga.distance_matrix, np.ndarray)
+        assert ga.distance_matrix.dtype == np.float64
+        route, distance = ga.evolve(verbose=False)
+        assert sorted(route) == list(range(len(cities)))
+        expected = sum(matrix[route[i - 1]][route[i]] for i in range(len(route)))
+        assert math.isclose(distance, expected)
+
+
+def test_array_engine_rejects_other_operators():
+    cities = random_cities(20, 0)
+    GeneticTSP(cities, engine='array')
+    with pytest.raises(ValueError):
+        GeneticTSP(cities, engine='array', crossover_operator='pmx')
+    with pytest.raises(ValueError):
+        GeneticTSP(cities, engine='array', mutation_operator='swap')
+
+
+def test_evolve_iter_rejects_invalid_every():
+    ga = GeneticTSP(random_cities(20, 0), generations=5, seed=0)
+    for every in (0, -1):
+        with pytest.raises(ValueError):
+            next(ga.evolve_iter(every=every))
@@ -0,0 +1,32 @@
+import random
+
+from tictactoe_engine import BitboardTicTacToe, ListMinimax, TranspositionTable
+
+
+def random_positions(count, seed=0):
+    """Các bàn cờ 3×3 ngẫu nhiên chưa kết thúc (X đi trước), kèm lượt đi"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = [[0] * 3 for _ in range(3)]
+        player = 1
+        for _ in range(rng.randint(0, 6)):
+            row, col = rng.choice([(r, c) for r in range(3) for c in range(3)
+                                   if board[r][c] == 0])
+            board[row][col] = player
+            player = -player
+        if not BitboardTicTacToe.from_board(board).is_terminal():
+            positions.append((board, player == 1))
+    return positions
+
+
+def test_bitboard_matches_list_search():
+    """Lõi bitboard (có và không có bảng chuyển vị) cho cùng nước đi và điểm
+    như thuật toán gốc trên list"""
+    positions = [([[0] * 3 for _ in range(3)], True)] + random_positions(30)
+    for board, is_maximizing in positions:
+        for depth in (2, 8):
+            expected = ListMinimax().best_move([row[:] for row in board], is_maximizing, depth)
+            for table in (None, TranspositionTable()):
+                engine = BitboardTicTacToe.from_board(board, table)
+                assert engine.best_move(is_maximizing, depth) == expected, (board, depth)
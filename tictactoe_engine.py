@@ -0,0 +1,334 @@
+import copy
+import time
+
+# Ô (hàng, cột) ứng với bit hàng * 3 + cột; X = 1 (MAX), O = -1 (MIN)
+FULL_BOARD = 0x1FF
+
+# Tám đường thắng: 3 hàng, 3 cột, 2 đường chéo
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+)
+
+# WINNING[bits] = True nếu tập ô bits chứa trọn một đường thắng (tra bảng O(1))
+WINNING = tuple(any(bits & mask == mask for mask in WIN_MASKS) for bits in range(1 << 9))
+
+
+# Tám phép đối xứng của bàn cờ (quay 0/90/180/270 độ, có/không lật): ô
+# (hàng, cột) được đưa tới ô f(hàng, cột)
+SYMMETRIES = (
+    lambda r, c: (r, c), lambda r, c: (c, 2 - r), lambda r, c: (2 - r, 2 - c),
+    lambda r, c: (2 - c, r), lambda r, c: (r, 2 - c), lambda r, c: (c, r),
+    lambda r, c: (2 - r, c), lambda r, c: (2 - c, 2 - r),
+)
+
+
+def _symmetry_table(transform):
+    """Bảng 512 phần tử: tập ô 9 bit -> tập ô sau phép đối xứng"""
+    target = [transform(*divmod(sq, 3)) for sq in range(9)]
+    table = []
+    for bits in range(1 << 9):
+        mapped = 0
+        for sq in range(9):
+            if bits >> sq & 1:
+                mapped |= 1 << (target[sq][0] * 3 + target[sq][1])
+        table.append(mapped)
+    return tuple(table)
+
+
+SYMMETRY_TABLES = tuple(_symmetry_table(transform) for transform in SYMMETRIES)
+
+# Loại cận của giá trị lưu trong bảng chuyển vị
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def canonical_key(x_bits, o_bits, is_maximizing):
+    """Khóa của thế cờ, giống nhau cho cả 8 phép đối xứng: nhỏ nhất của
+    x | o << 9 trên các phép đối xứng, kèm bên đang đi ở bit 18"""
+    key = min(table[x_bits] | table[o_bits] << 9 for table in SYMMETRY_TABLES)
+    return key | (is_maximizing << 18)
+
+
+class TranspositionTable:
+    def __init__(self):
+        """
+        Bảng chuyển vị cho Minimax tic-tac-toe, khóa theo thế cờ chuẩn hóa qua
+        8 phép đối xứng; mỗi mục lưu (giá trị, độ sâu, loại cận, số nút của cây con)
+        """
+        self.entries = {}
+        self.reset_stats()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def reset_stats(self):
+        """Đặt lại bộ đếm (giữ nguyên các mục đã lưu)"""
+        self.probes = 0
+        self.hits = 0
+        self.saved_nodes = 0
+
+    @property
+    def hit_rate(self):
+        """Tỷ lệ tra cứu trả được giá trị dùng ngay (0 nếu chưa tra cứu)"""
+        return self.hits / self.probes if self.probes else 0.0
+
+    def clear(self):
+        self.entries.clear()
+        self.reset_stats()
+
+
+def square(row, col):
+    """Chỉ số bit của ô (hàng, cột)"""
+    return row * 3 + col
+
+
+def coordinates(sq):
+    """Ô (hàng, cột) của chỉ số bit"""
+    return divmod(sq, 3)
+
+
+class BitboardTicTacToe:
+    def __init__(self, x_bits=0, o_bits=0, table=None):
+        """
+        Lõi tìm kiếm Minimax cho tic-tac-toe trên bitboard
+        - x_bits, o_bits: hai số nguyên 9 bit, bit hàng * 3 + cột bật nếu X/O ở ô đó
+        - table: TranspositionTable dùng chung giữa các lần tìm kiếm (None = không dùng)
+        Nước đi được đặt và gỡ tại chỗ (make/unmake), không sao chép bàn cờ.
+        """
+        self.bits = [x_bits, o_bits]
+        self.table = table
+        self.nodes = 0
+
+    @classmethod
+    def from_board(cls, board, table=None):
+        """Tạo từ bàn cờ dạng list 3 × 3 (X = 1, O = -1, trống = 0)"""
+        x_bits = o_bits = 0
+        for row in range(3):
+            for col in range(3):
+                if board[row][col] == 1:
+                    x_bits |= 1 << square(row, col)
+                elif board[row][col] == -1:
+                    o_bits |= 1 << square(row, col)
+        return cls(x_bits, o_bits, table)
+
+    def to_board(self):
+        """Bàn cờ dạng list 3 × 3"""
+        x_bits, o_bits = self.bits
+        return [[1 if x_bits >> square(row, col) & 1 else -1 if o_bits >> square(row, col) & 1 else 0
+                 for col in range(3)] for row in range(3)]
+
+    def make(self, sq, player):
+        """Đặt quân của player (1 hoặc -1) vào ô sq"""
+        self.bits[player < 0] |= 1 << sq
+
+    def unmake(self, sq, player):
+        """Gỡ quân của player khỏi ô sq"""
+        self.bits[player < 0] &= ~(1 << sq)
+
+    def winner(self):
+        """1 nếu X thắng, -1 nếu O thắng, 0 nếu chưa ai thắng"""
+        if WINNING[self.bits[0]]:
+            return 1
+        if WINNING[self.bits[1]]:
+            return -1
+        return 0
+
+    def is_full(self):
+        return self.bits[0] | self.bits[1] == FULL_BOARD
+
+    def is_terminal(self):
+        return self.winner() != 0 or self.is_full()
+
+    def moves(self):
+        """Các ô trống theo thứ tự hàng rồi cột"""
+        occupied = self.bits[0] | self.bits[1]
+        return [sq for sq in range(9) if not occupied >> sq & 1]
+
+    def minimax(self, depth, is_maximizing, alpha=float('-inf'), beta=float('inf')):
+        """Minimax với cắt tỉa alpha-beta, giới hạn depth nước; điểm 1/0/-1"""
+        self.nodes += 1
+        bits = self.bits
+        if WINNING[bits[0]]:
+            return 1
+        if WINNING[bits[1]]:
+            return -1
+        occupied = bits[0] | bits[1]
+        if occupied == FULL_BOARD or depth == 0:
+            return 0
+
+        table = self.table
+        if table is not None:
+            # Độ sâu không vượt quá số ô trống: khi đó kết quả là chính xác
+            depth = min(depth, 9 - bin(occupied).count('1'))
+            key = canonical_key(bits[0], bits[1], is_maximizing)
+            table.probes += 1
+            entry = table.entries.get(key)
+            if entry is not None and entry[1] >= depth:
+                value, _, bound, subtree_nodes = entry
+                if bound == LOWER:
+                    alpha = max(alpha, value)
+                elif bound == UPPER:
+                    beta = min(beta, value)
+                if bound == EXACT or beta <= alpha:
+                    table.hits += 1
+                    table.saved_nodes += subtree_nodes
+                    return value
+            alpha_start, beta_start, nodes_start = alpha, beta, self.nodes
+
+        side = 0 if is_maximizing else 1
+        best = float('-inf') if is_maximizing else float('inf')
+        for sq in range(9):
+            bit = 1 << sq
+            if occupied & bit:
+                continue
+            bits[side] |= bit
+            score = self.minimax(depth - 1, not is_maximizing, alpha, beta)
+            bits[side] ^= bit
+            if is_maximizing:
+                best = max(best, score)
+                alpha = max(alpha, score)
+            else:
+                best = min(best, score)
+                beta = min(beta, score)
+            if beta <= alpha:
+                break
+
+        if table is not None:
+            if best <= alpha_start:
+                bound = UPPER
+            elif best >= beta_start:
+                bound = LOWER
+            else:
+                bound = EXACT
+            table.entries[key] = (best, depth, bound, self.nodes - nodes_start)
+        return best
+
+    def best_move(self, is_maximizing, depth=4):
+        """Nước đi tốt nhất cho bên đang đi
+
+        Trả về (nước đi (hàng, cột), điểm, danh sách (nước đi, điểm) của mọi
+        nước đi) giống MinimaxTicTacToe.get_best_move.
+        """
+        player = 1 if is_maximizing else -1
+        best_move = None
+        best_score = float('-inf') if is_maximizing else float('inf')
+        moves_with_scores = []
+        for sq in self.moves():
+            self.make(sq, player)
+            score = self.minimax(depth, not is_maximizing)
+            self.unmake(sq, player)
+            move = coordinates(sq)
+            moves_with_scores.append((move, score))
+            if is_maximizing and score > best_score or not is_maximizing and score < best_score:
+                best_score = score
+                best_move = move
+        return best_move, best_score, moves_with_scores
+
+
+class ListMinimax:
+    """Thuật toán gốc của MinimaxTicTacToe (list 3 × 3, deepcopy mỗi nút, quét
+    lại hàng/cột/đường chéo), giữ lại làm mốc so sánh trong benchmark"""
+
+    def __init__(self):
+        self.nodes = 0
+
+    def evaluate_board(self, board):
+        for row in board:
+            if abs(sum(row)) == 3:
+                return sum(row) // 3
+        for col in range(3):
+            col_sum = sum(board[row][col] for row in range(3))
+            if abs(col_sum) == 3:
+                return col_sum // 3
+        diag1 = board[0][0] + board[1][1] + board[2][2]
+        diag2 = board[0][2] + board[1][1] + board[2][0]
+        if abs(diag1) == 3:
+            return diag1 // 3
+        if abs(diag2) == 3:
+            return diag2 // 3
+        return 0
+
+    def is_terminal(self, board):
+        if self.evaluate_board(board) != 0:
+            return True
+        return all(0 not in row for row in board)
+
+    def get_possible_moves(self, board):
+        return [(i, j) for i in range(3) for j in range(3) if board[i][j] == 0]
+
+    def minimax(self, board, depth, is_maximizing, alpha=float('-inf'), beta=float('inf')):
+        self.nodes += 1
+        score = self.evaluate_board(board)
+        if score != 0:
+            return score
+        if self.is_terminal(board) or depth == 0:
+            return score
+        best = float('-inf') if is_maximizing else float('inf')
+        for move in self.get_possible_moves(board):
+            new_board = copy.deepcopy(board)
+            new_board[move[0]][move[1]] = 1 if is_maximizing else -1
+            eval_score = self.minimax(new_board, depth - 1, not is_maximizing, alpha, beta)
+            if is_maximizing:
+                best = max(best, eval_score)
+                alpha = max(alpha, eval_score)
+            else:
+                best = min(best, eval_score)
+                beta = min(beta, eval_score)
+            if beta <= alpha:
+                break
+        return best
+
+    def best_move(self, board, is_maximizing, depth=4):
+        player = 1 if is_maximizing else -1
+        best_move = None
+        best_score = float('-inf') if is_maximizing else float('inf')
+        moves_with_scores = []
+        for move in self.get_possible_moves(board):
+            new_board = copy.deepcopy(board)
+            new_board[move[0]][move[1]] = player
+            score = self.minimax(new_board, depth, not is_maximizing)
+            moves_with_scores.append((move, score))
+            if is_maximizing and score > best_score or not is_maximizing and score < best_score:
+                best_score = score
+                best_move = move
+        return best_move, best_score, moves_with_scores
+
+
+def benchmark(depth=8, repeats=3):
+    """Đo số nút/giây của thuật toán gốc (list + deepcopy), lõi bitboard và lõi
+    bitboard kèm bảng chuyển vị đối xứng (bảng mới cho mỗi lần đo)
+
+    Tìm nước đi từ bàn cờ trống (X đi) với độ sâu depth. Trả về dict số nút,
+    thời gian và nút/giây của mỗi bên.
+    """
+    empty = [[0] * 3 for _ in range(3)]
+    results = {}
+    for name in ('list', 'bitboard', 'transposition'):
+        best_time = float('inf')
+        for _ in range(repeats):
+            if name == 'list':
+                engine = ListMinimax()
+                start = time.perf_counter()
+                engine.best_move(empty, True, depth)
+            else:
+                table = TranspositionTable() if name == 'transposition' else None
+                engine = BitboardTicTacToe.from_board(empty, table)
+                start = time.perf_counter()
+                engine.best_move(True, depth)
+            best_time = min(best_time, time.perf_counter() - start)
+        results[name] = {'nodes': engine.nodes, 'seconds': best_time,
+                         'nodes_per_second': engine.nodes / best_time}
+    results['speedup'] = (results['bitboard']['nodes_per_second']
+                          / results['list']['nodes_per_second'])
+    return results
+
+
+# Ví dụ sử dụng
+if __name__ == "__main__":
+    results = benchmark()
+    for name in ('list', 'bitboard', 'transposition'):
+        row = results[name]
+        print(f"{name:<13} {row['nodes']:>8} nút  {row['seconds']:.3f}s  "
+              f"{row['nodes_per_second']:>12,.0f} nút/giây")
+    print(f"Tăng tốc: ×{results['speedup']:.1f}")
@@ -0,0 +1,154 @@
+import os
+
+import numpy as np
+
+from tictactoe_engine import FULL_BOARD, WINNING, BitboardTicTacToe, TranspositionTable
+
+# File bảng nước đi hoàn hảo, nạp lười ở lần tra cứu đầu tiên (tự tạo nếu chưa có)
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tictactoe_table.npy')
+
+# Mỗi phần tử uint16 của bảng (chỉ số = mã cơ số 3 của thế cờ, ô trống/X/O = 0/1/2):
+# bit 0-8 là tập nước đi tốt nhất, bit 9-10 là giá trị + 1 (X thắng = 1,
+# hòa = 0, O thắng = -1, theo lối chơi hoàn hảo), bit 15 bật nếu thế cờ đạt được
+NUM_CODES = 3 ** 9
+MOVES_MASK = 0x1FF
+VALUE_SHIFT = 9
+REACHABLE = 1 << 15
+
+# TERNARY[bits] = tổng 3^ô trên các ô của bits, để tính mã cơ số 3 từ bitboard
+TERNARY = tuple(sum(3 ** sq for sq in range(9) if bits >> sq & 1) for bits in range(1 << 9))
+
+_table = None
+
+
+def position_code(x_bits, o_bits):
+    """Mã cơ số 3 của thế cờ (0 .. 3^9 - 1)"""
+    return TERNARY[x_bits] + 2 * TERNARY[o_bits]
+
+
+def solve():
+    """Giải toàn bộ tic-tac-toe: liệt kê mọi thế cờ đạt được từ bàn trống theo
+    từng lớp số quân (BFS), rồi tính giá trị ngược từ lớp cuối về lớp đầu
+
+    Trả về mảng uint16 NUM_CODES phần tử theo định dạng ở đầu module.
+    """
+    layers = [{(0, 0)}]
+    for ply in range(9):
+        side = ply % 2
+        following = set()
+        for position in layers[-1]:
+            x_bits, o_bits = position
+            if WINNING[x_bits] or WINNING[o_bits]:
+                continue
+            occupied = x_bits | o_bits
+            for sq in range(9):
+                if not occupied >> sq & 1:
+                    child = list(position)
+                    child[side] |= 1 << sq
+                    following.add(tuple(child))
+        layers.append(following)
+
+    table = np.zeros(NUM_CODES, dtype=np.uint16)
+    values = {}
+    for ply in range(9, -1, -1):
+        is_maximizing = ply % 2 == 0
+        for x_bits, o_bits in layers[ply]:
+            occupied = x_bits | o_bits
+            if WINNING[x_bits]:
+                value, best = 1, 0
+            elif WINNING[o_bits]:
+                value, best = -1, 0
+            elif occupied == FULL_BOARD:
+                value, best = 0, 0
+            else:
+                children = {}
+                for sq in range(9):
+                    if not occupied >> sq & 1:
+                        child = (x_bits | 1 << sq, o_bits) if is_maximizing else (x_bits, o_bits | 1 << sq)
+                        children[sq] = values[child]
+                value = max(children.values()) if is_maximizing else min(children.values())
+                best = sum(1 << sq for sq, child_value in children.items() if child_value == value)
+            values[x_bits, o_bits] = value
+            table[position_code(x_bits, o_bits)] = REACHABLE | (value + 1) << VALUE_SHIFT | best
+    return table
+
+
+def save_table(table, path=TABLE_PATH):
+    """Ghi bảng ra file .npy (ghi file tạm rồi đổi tên)"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_table(path=TABLE_PATH):
+    """Nạp bảng từ file; giải và ghi file nếu chưa có"""
+    if os.path.exists(path):
+        return np.load(path)
+    table = solve()
+    save_table(table, path)
+    return table
+
+
+def get_table():
+    """Bảng dùng chung của tiến trình, chỉ nạp ở lần gọi đầu tiên"""
+    global _table
+    if _table is None:
+        _table = load_table()
+    return _table
+
+
+def lookup(x_bits, o_bits):
+    """Tra thế cờ: (giá trị, danh sách ô của các nước đi tốt nhất) hoặc None nếu
+    thế cờ không đạt được từ bàn trống khi X đi trước"""
+    entry = int(get_table()[position_code(x_bits, o_bits)])
+    if not entry & REACHABLE:
+        return None
+    value = (entry >> VALUE_SHIFT & 3) - 1
+    return value, [sq for sq in range(9) if entry >> sq & 1]
+
+
+def x_to_move(x_bits, o_bits):
+    """Bên đi tiếp của thế cờ đạt được: X nếu hai bên có số quân bằng nhau"""
+    return bin(x_bits).count('1') == bin(o_bits).count('1')
+
+
+def verify(table=None):
+    """Kiểm chứng bảng bằng tìm kiếm đầy đủ (alpha-beta + bảng chuyển vị) trên mọi
+    thế cờ chưa kết thúc; trả về danh sách mã thế cờ sai lệch (rỗng nếu đúng)"""
+    table = get_table() if table is None else table
+    transposition = TranspositionTable()
+    mismatches = []
+    for code in np.flatnonzero(table & REACHABLE):
+        entry = int(table[code])
+        best = entry & MOVES_MASK
+        if not best:
+            continue
+        digits = [code // 3 ** sq % 3 for sq in range(9)]
+        x_bits = sum(1 << sq for sq, digit in enumerate(digits) if digit == 1)
+        o_bits = sum(1 << sq for sq, digit in enumerate(digits) if digit == 2)
+        engine = BitboardTicTacToe(x_bits, o_bits, transposition)
+        _, value, moves_with_scores = engine.best_move(x_to_move(x_bits, o_bits), depth=9)
+        searched_best = sum(1 << (row * 3 + col) for (row, col), score in moves_with_scores
+                            if score == value)
+        if value != (entry >> VALUE_SHIFT & 3) - 1 or searched_best != best:
+            mismatches.append(int(code))
+    return mismatches
+
+
+# Ví dụ sử dụng
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    table = solve()
+    print(f"Giải xong {int(np.count_nonzero(table & REACHABLE))} thế cờ "
+          f"trong {time.perf_counter() - start:.2f}s")
+    print(f"Đã ghi {save_table(table)} ({table.nbytes} byte dữ liệu)")
+    value, best = lookup(0, 0)
+    print(f"Bàn trống: giá trị {value}, nước đi tốt nhất {[divmod(sq, 3) for sq in best]}")
+    start = time.perf_counter()
+    mismatches = verify(table)
+    print(f"Kiểm chứng bằng tìm kiếm: {len(mismatches)} sai lệch "
+          f"({time.perf_counter() - start:.2f}s)")
@@ -0,0 +1,149 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from nguoidulich import GeneticTSP
+
+
+def _solve_batch(batch, ga_kwargs, evolve_kwargs):
+    """Giải một lô bộ dữ liệu nhỏ trong cùng một tác vụ của worker
+
+    - batch: danh sách (chỉ số, tọa độ, ma trận khoảng cách hoặc None, seed)
+    Trả về danh sách (chỉ số, lộ trình, khoảng cách).
+    """
+    results = []
+    for index, cities, distance_matrix, seed in batch:
+        num_cities = len(cities) if cities is not None else len(distance_matrix)
+        if num_cities <= 3:
+            route = list(range(num_cities))
+            ga = GeneticTSP(cities, distance_matrix=distance_matrix)
+            results.append((index, route, ga.calculate_route_distance(route)))
+            continue
+        ga = GeneticTSP(cities, distance_matrix=distance_matrix, seed=seed, **ga_kwargs)
+        route, distance = ga.evolve(verbose=False, **evolve_kwargs)
+        results.append((index, route, distance))
+    return results
+
+
+class BatchSolver:
+    def __init__(self, max_workers=None, batch_size=16, seed=0,
+                 evolve_kwargs=None, **ga_kwargs):
+        """
+        Giải nhiều bộ dữ liệu TSP nhỏ trên một nhóm tiến trình dùng lâu dài
+        - max_workers: số tiến trình (None = số lõi CPU)
+        - batch_size: số bộ dữ liệu gộp vào một tác vụ để giảm chi phí mỗi tác vụ
+        - seed: hạt giống gốc; bộ dữ liệu thứ i dùng seed + i
+        - evolve_kwargs: tham số cho GeneticTSP.evolve (mặc định dừng khi
+          50 thế hệ không cải thiện)
+        - ga_kwargs: tham số truyền cho GeneticTSP của mỗi bộ dữ liệu
+        """
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.seed = seed
+        self.evolve_kwargs = {'stall_generations': 50} if evolve_kwargs is None else evolve_kwargs
+        self.ga_kwargs = ga_kwargs
+        self.executor = None
+
+    def start(self):
+        """Khởi động nhóm tiến trình (chỉ một lần, dùng lại cho các lần gọi sau)"""
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self
+
+    def close(self):
+        """Dừng nhóm tiến trình"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def make_batches(self, instances):
+        """Gộp các bộ dữ liệu thành lô; bộ lớn được đưa lên trước để cân bằng tải"""
+        items = []
+        for index, instance in enumerate(instances):
+            # Chấp nhận danh sách tọa độ hoặc đối tượng có coords/distance_matrix (TSPInstance)
+            if hasattr(instance, 'distance_matrix'):
+                cities, matrix = instance.coords, np.asarray(instance.distance_matrix)
+            else:
+                cities, matrix = instance, None
+            items.append((index, cities, matrix, self.seed + index))
+        items.sort(key=lambda item: -(len(item[1]) if item[1] is not None else len(item[2])))
+        return [items[i:i + self.batch_size] for i in range(0, len(items), self.batch_size)]
+
+    def solve_many(self, instances):
+        """Giải danh sách bộ dữ liệu, trả về (chỉ số, lộ trình, khoảng cách) ngay khi xong
+
+        Kết quả đến theo thứ tự hoàn thành, không theo thứ tự đầu vào.
+        """
+        self.start()
+        futures = [self.executor.submit(_solve_batch, batch, self.ga_kwargs, self.evolve_kwargs)
+                   for batch in self.make_batches(instances)]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+# Nhóm tiến trình dùng chung cho hàm solve_many cấp module
+_default_solver = None
+_default_config = None
+
+
+def solve_many(instances, max_workers=None, batch_size=16, seed=0,
+               evolve_kwargs=None, **ga_kwargs):
+    """Giải nhiều bộ dữ liệu nhỏ trên nhóm tiến trình dùng chung, trả kết quả dạng luồng
+
+    Nhóm tiến trình được giữ lại giữa các lần gọi có cùng cấu hình.
+    """
+    global _default_solver, _default_config
+    config = (max_workers, batch_size, seed, evolve_kwargs, ga_kwargs)
+    if _default_solver is None or _default_config != config:
+        if _default_solver is not None:
+            _default_solver.close()
+        _default_solver = BatchSolver(max_workers, batch_size, seed, evolve_kwargs, **ga_kwargs)
+        _default_config = config
+    return _default_solver.solve_many(instances)
+
+
+def random_instances(count, min_stops=8, max_stops=40, seed=0):
+    """Sinh các bộ dữ liệu nhỏ ngẫu nhiên (mô phỏng lộ trình của từng nhóm khách)"""
+    rng = random.Random(seed)
+    return [[[rng.uniform(0, 100), rng.uniform(0, 100)]
+             for _ in range(rng.randint(min_stops, max_stops))]
+            for _ in range(count)]
+
+
+def measure_throughput(num_instances=200, min_stops=8, max_stops=40, max_workers=None,
+                       batch_size=16, **ga_kwargs):
+    """Đo thông lượng (bộ dữ liệu/giây) của solve_many"""
+    instances = random_instances(num_instances, min_stops, max_stops)
+    with BatchSolver(max_workers=max_workers, batch_size=batch_size, **ga_kwargs) as solver:
+        start = time.perf_counter()
+        distances = [distance for _, _, distance in solver.solve_many(instances)]
+        elapsed = time.perf_counter() - start
+    return {
+        'num_instances': num_instances,
+        'min_stops': min_stops,
+        'max_stops': max_stops,
+        'batch_size': batch_size,
+        'wall_time': elapsed,
+        'instances_per_second': num_instances / elapsed if elapsed > 0 else None,
+        'mean_distance': float(np.mean(distances)),
+    }
+
+
+# Ví dụ sử dụng
+if __name__ == "__main__":
+    instances = random_instances(200)
+    start = time.perf_counter()
+    with BatchSolver(population_size=50, generations=200, elite_size=10) as solver:
+        for count, (index, route, distance) in enumerate(solver.solve_many(instances), 1):
+            if count % 50 == 0:
+                print(f"Đã xong {count} bộ dữ liệu (bộ #{index}: {distance:.2f})")
+    elapsed = time.perf_counter() - start
+    print(f"Thông lượng: {len(instances) / elapsed:.1f} bộ dữ liệu/giây")
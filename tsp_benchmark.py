@@ -0,0 +1,237 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+
+import held_karp
+from nguoidulich import GeneticTSP
+from tsp_batch import measure_throughput
+from tsplib import TSPInstance, bundled_instances, instance_key, known_optima, load_instance
+
+# Các cấu hình GeneticTSP được so sánh (tên -> tham số khởi tạo); các cấu hình
+# GA tắt Held–Karp để luôn đo giải thuật di truyền kể cả trên bộ dữ liệu nhỏ
+CONFIGURATIONS = {
+    'list': {'engine': 'list', 'exact_threshold': 0},
+    'array': {'engine': 'array', 'exact_threshold': 0},
+    'memetic': {'engine': 'list', 'local_search': 'elites', 'exact_threshold': 0},
+    'adaptive': {'engine': 'list', 'adaptive': True, 'exact_threshold': 0},
+    'exact': {'exact_threshold': held_karp.MAX_CITIES + 1},
+}
+
+
+def git_commit():
+    """Mã commit hiện tại (None nếu không nằm trong git)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_one(instance, config_name, seed, generations, population_size, optimum=None):
+    """Chạy một cấu hình trên một bộ dữ liệu và đo thời gian, bộ nhớ, độ lệch"""
+    kwargs = dict(CONFIGURATIONS[config_name])
+    if config_name == 'exact' and instance.dimension > held_karp.MAX_CITIES:
+        return None
+
+    def make_ga(num_generations):
+        return GeneticTSP(instance.coords, population_size=population_size,
+                          generations=num_generations,
+                          elite_size=max(1, population_size // 5),
+                          distance_matrix=instance.distance_matrix, seed=seed, **kwargs)
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    ga = make_ga(generations)
+    best_route, _ = ga.evolve(verbose=False)
+    wall_time = time.perf_counter() - start
+    cpu_time = time.process_time() - cpu_start
+
+    # Đo bộ nhớ đỉnh trong một lần chạy ngắn riêng - tracemalloc làm chậm
+    # vòng lặp nên không bật trong lần chạy đo thời gian
+    tracemalloc.start()
+    make_ga(min(generations, 10)).evolve(verbose=False)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best_distance = instance.tour_length(best_route)
+    completed = len(ga.best_fitness_history)
+    result = {
+        'instance': instance.name,
+        'dimension': instance.dimension,
+        'config': config_name,
+        'seed': seed,
+        'generations': completed,
+        'wall_time': wall_time,
+        'cpu_time': cpu_time,
+        'generations_per_second': completed / wall_time if wall_time > 0 else None,
+        'evaluations': ga.evaluation_count,
+        'peak_memory_bytes': peak_memory,
+        'best_distance': best_distance,
+        'optimum': optimum,
+        'gap_percent': None,
+        'quality_per_cpu_second': None,
+    }
+    if optimum:
+        result['gap_percent'] = 100.0 * (best_distance - optimum) / optimum
+        # Chất lượng = optimum / độ dài (1 là tối ưu), chia cho thời gian CPU
+        if cpu_time > 0:
+            result['quality_per_cpu_second'] = optimum / best_distance / cpu_time
+    return result
+
+
+def random_instance(num_cities, seed=0):
+    """Bộ dữ liệu Euclidean ngẫu nhiên (không làm tròn) để đo độ lệch bằng Held–Karp"""
+    rng = np.random.default_rng(seed)
+    coords = rng.uniform(0, 100, (num_cities, 2))
+    diff = coords[:, None, :] - coords[None, :, :]
+    matrix = np.sqrt((diff ** 2).sum(axis=2))
+    return TSPInstance(f'random{num_cities}', num_cities, 'EUC_2D', matrix,
+                       coords=coords.tolist())
+
+
+def run_benchmark(instance_names=None, config_names=None, seeds=(0, 1, 2),
+                  generations=500, population_size=100, random_sizes=()):
+    """Chạy mọi tổ hợp bộ dữ liệu × cấu hình × hạt giống, trả về danh sách kết quả
+
+    Bộ dữ liệu không có lời giải tối ưu đã biết nhưng đủ nhỏ được giải chính
+    xác bằng Held–Karp để tính độ lệch thật của GA.
+    """
+    if instance_names is None:
+        instance_names = bundled_instances()
+    config_names = config_names or list(CONFIGURATIONS)
+    optima = known_optima()
+    instances = [load_instance(name) for name in instance_names]
+    instances += [random_instance(size) for size in random_sizes]
+    results = []
+    for instance in instances:
+        name = instance.name
+        optimum = optima.get(instance_key(name))
+        if optimum is None and instance.dimension <= held_karp.MAX_CITIES:
+            optimum = held_karp.held_karp(instance.distance_matrix)[1]
+        for config_name in config_names:
+            for seed in seeds:
+                result = run_one(instance, config_name, seed, generations,
+                                 population_size, optimum)
+                if result is not None:
+                    results.append(result)
+                    gap = result['gap_percent']
+                    print(f"{name:<12} {config_name:<10} seed={seed} "
+                          f"{result['wall_time']:7.2f}s "
+                          f"{result['generations_per_second']:8.1f} thế hệ/s "
+                          f"dài={result['best_distance']:.0f}"
+                          + (f" lệch={gap:.2f}%" if gap is not None else ""))
+    return results
+
+
+def summarize(results):
+    """Trung bình theo (bộ dữ liệu, cấu hình) của các chỉ số chính"""
+    groups = {}
+    for result in results:
+        groups.setdefault((result['instance'], result['config']), []).append(result)
+    summary = []
+    for (name, config_name), group in groups.items():
+        gaps = [r['gap_percent'] for r in group if r['gap_percent'] is not None]
+        qualities = [r['quality_per_cpu_second'] for r in group
+                     if r['quality_per_cpu_second'] is not None]
+        summary.append({
+            'instance': name,
+            'config': config_name,
+            'runs': len(group),
+            'mean_wall_time': float(np.mean([r['wall_time'] for r in group])),
+            'mean_cpu_time': float(np.mean([r['cpu_time'] for r in group])),
+            'mean_evaluations': float(np.mean([r['evaluations'] for r in group])),
+            'mean_generations_per_second':
+                float(np.mean([r['generations_per_second'] for r in group])),
+            'max_peak_memory_bytes': max(r['peak_memory_bytes'] for r in group),
+            'best_distance': min(r['best_distance'] for r in group),
+            'mean_gap_percent': float(np.mean(gaps)) if gaps else None,
+            'mean_quality_per_cpu_second': float(np.mean(qualities)) if qualities else None,
+        })
+    return summary
+
+
+def compare_adaptive(summary, static_config='list'):
+    """So sánh cấu hình 'adaptive' với cấu hình tĩnh tương ứng trên từng bộ dữ liệu
+
+    Trả về danh sách tỷ lệ adaptive / tĩnh của chất lượng trên mỗi giây CPU,
+    độ lệch trung bình và số lượt đánh giá.
+    """
+    rows = {(row['instance'], row['config']): row for row in summary}
+    comparison = []
+    for (name, config_name), adaptive in rows.items():
+        static = rows.get((name, static_config))
+        if config_name != 'adaptive' or static is None:
+            continue
+        static_quality = static['mean_quality_per_cpu_second']
+        adaptive_quality = adaptive['mean_quality_per_cpu_second']
+        comparison.append({
+            'instance': name,
+            'static_config': static_config,
+            'static_quality_per_cpu_second': static_quality,
+            'adaptive_quality_per_cpu_second': adaptive_quality,
+            'quality_per_cpu_second_ratio': adaptive_quality / static_quality
+            if static_quality and adaptive_quality is not None else None,
+            'static_gap_percent': static['mean_gap_percent'],
+            'adaptive_gap_percent': adaptive['mean_gap_percent'],
+            'evaluations_ratio': adaptive['mean_evaluations'] / static['mean_evaluations'],
+        })
+    return comparison
+
+
+def write_results(results, path, throughput=None):
+    """Ghi kết quả ra JSON kèm thông tin môi trường để so sánh giữa các commit
+    - throughput: kết quả đo thông lượng solve_many (nếu có)
+    """
+    summary = summarize(results)
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': results,
+        'summary': summary,
+        'adaptive_vs_static': compare_adaptive(summary),
+        'throughput': throughput,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark GeneticTSP trên các bộ dữ liệu TSPLIB")
+    parser.add_argument('--instances', nargs='*', help="tên bộ dữ liệu (mặc định: tất cả)")
+    parser.add_argument('--configs', nargs='*', choices=list(CONFIGURATIONS),
+                        help="cấu hình (mặc định: tất cả)")
+    parser.add_argument('--random-sizes', nargs='*', type=int, default=[],
+                        help="thêm bộ dữ liệu ngẫu nhiên với số thành phố này (độ lệch đo bằng Held–Karp)")
+    parser.add_argument('--seeds', nargs='*', type=int, default=[0, 1, 2])
+    parser.add_argument('--generations', type=int, default=500)
+    parser.add_argument('--population-size', type=int, default=100)
+    parser.add_argument('--throughput', type=int, default=200, metavar='N',
+                        help="số bộ dữ liệu nhỏ (8-40 điểm) để đo thông lượng solve_many; 0 = bỏ qua")
+    parser.add_argument('--output', default='benchmark_results.json')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.instances, args.configs, args.seeds,
+                            args.generations, args.population_size, args.random_sizes)
+    throughput = None
+    if args.throughput:
+        throughput = measure_throughput(args.throughput, population_size=args.population_size,
+                                        generations=args.generations,
+                                        elite_size=max(1, args.population_size // 5))
+        print(f"solve_many: {throughput['instances_per_second']:.1f} bộ dữ liệu/giây "
+              f"({args.throughput} bộ dữ liệu)")
+    report = write_results(results, args.output, throughput)
+    for row in report['adaptive_vs_static']:
+        ratio = row['quality_per_cpu_second_ratio']
+        print(f"{row['instance']:<12} adaptive/tĩnh: chất lượng/giây CPU ×"
+              + (f"{ratio:.2f}" if ratio is not None else "-")
+              + f", lượt đánh giá ×{row['evaluations_ratio']:.2f}")
+    print(f"\nĐã ghi {len(results)} kết quả vào {args.output}")
@@ -0,0 +1,89 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Phiên bản định dạng file checkpoint
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(path, arrays, meta):
+    """Ghi checkpoint dạng .npz nén: các mảng NumPy cùng siêu dữ liệu JSON
+
+    Ghi ra file tạm cạnh path rồi đổi tên nguyên tử, nên file cũ vẫn còn
+    nguyên nếu tiến trình bị dừng giữa chừng.
+    """
+    meta = dict(meta, version=CHECKPOINT_VERSION)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, meta=np.frombuffer(json.dumps(meta).encode('utf-8'),
+                                                  dtype=np.uint8), **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_checkpoint(path):
+    """Đọc checkpoint, trả về (dict các mảng, siêu dữ liệu)"""
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files if name != 'meta'}
+        meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+    if meta.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Không hỗ trợ checkpoint phiên bản {meta.get('version')}")
+    return arrays, meta
+
+
+class CheckpointWriter:
+    def __init__(self, path, every=None, seconds=None):
+        """
+        Ghi checkpoint định kỳ trên một luồng nền, ngoài vòng lặp thế hệ
+        - path: đường dẫn file checkpoint (bị ghi đè mỗi lần)
+        - every: ghi sau mỗi every thế hệ
+        - seconds: ghi khi đã qua ít nhất seconds giây từ lần ghi trước
+        Vòng lặp chỉ chụp trạng thái (sao chép mảng); nén và ghi file diễn ra
+        trên luồng nền. Nếu lần ghi trước chưa xong, lần ghi mới được hoãn sang
+        thế hệ kế tiếp thay vì chặn vòng lặp.
+        """
+        if every is None and seconds is None:
+            raise ValueError("Cần every hoặc seconds để ghi checkpoint")
+        self.path = path
+        self.every = every
+        self.seconds = seconds
+        self.last_time = time.perf_counter()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = None
+        self.overdue = False
+        self.count = 0
+
+    def due(self, generation):
+        """True nếu đến lúc ghi checkpoint sau thế hệ thứ generation (đếm từ 1)
+        và luồng nền đã ghi xong lần trước"""
+        if self.every is not None and generation % self.every == 0:
+            self.overdue = True
+        elif self.seconds is not None and time.perf_counter() - self.last_time >= self.seconds:
+            self.overdue = True
+        return self.overdue and (self.pending is None or self.pending.done())
+
+    def submit(self, arrays, meta):
+        """Đưa một trạng thái đã chụp cho luồng nền ghi ra file"""
+        self.wait()
+        self.overdue = False
+        self.pending = self.executor.submit(save_checkpoint, self.path, arrays, meta)
+        self.last_time = time.perf_counter()
+        self.count += 1
+
+    def wait(self):
+        """Chờ lần ghi đang diễn ra (nếu có) và báo lỗi ghi file nếu có"""
+        if self.pending is not None:
+            pending, self.pending = self.pending, None
+            pending.result()
+
+    def close(self):
+        """Chờ lần ghi cuối và dừng luồng nền"""
+        try:
+            self.wait()
+        finally:
+            self.executor.shutdown()
@@ -0,0 +1,217 @@
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from nguoidulich import GeneticTSP
+from tsp_local_search import LocalSearch
+
+
+def grid_partition(coords, cluster_size):
+    """Chia thành phố theo lưới đều, mỗi ô khoảng cluster_size thành phố"""
+    n = len(coords)
+    cells_per_side = max(1, math.ceil(math.sqrt(n / cluster_size)))
+    low = coords.min(axis=0)
+    span = np.maximum(coords.max(axis=0) - low, 1e-12)
+    cells = np.minimum((coords - low) / span * cells_per_side, cells_per_side - 1).astype(np.int64)
+    labels = cells[:, 0] * cells_per_side + cells[:, 1]
+    # Đánh số lại để bỏ các ô trống
+    _, labels = np.unique(labels, return_inverse=True)
+    return labels
+
+
+def kmeans_partition(coords, cluster_size, iterations=15, seed=0, chunk=8192):
+    """Chia thành phố bằng k-means, tính khoảng cách theo từng khối để bộ nhớ tuyến tính"""
+    n = len(coords)
+    k = max(1, math.ceil(n / cluster_size))
+    rng = np.random.default_rng(seed)
+    centers = coords[rng.choice(n, size=k, replace=False)]
+    labels = np.zeros(n, dtype=np.int64)
+    for _ in range(iterations):
+        for begin in range(0, n, chunk):
+            block = coords[begin:begin + chunk]
+            d = ((block[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+            labels[begin:begin + chunk] = np.argmin(d, axis=1)
+        counts = np.bincount(labels, minlength=k)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, coords)
+        nonempty = counts > 0
+        centers[nonempty] = sums[nonempty] / counts[nonempty, None]
+    _, labels = np.unique(labels, return_inverse=True)
+    return labels
+
+
+def _solve_cluster(cluster_coords, ga_kwargs, seed):
+    """Giải TSP cho một cụm bằng GeneticTSP (chạy trong tiến trình worker)"""
+    m = len(cluster_coords)
+    if m <= 3:
+        return list(range(m))
+    ga = GeneticTSP(cluster_coords, seed=seed, **ga_kwargs)
+    route, _ = ga.evolve(verbose=False)
+    return route
+
+
+class ClusteredGeneticTSP:
+    def __init__(self, cities, cluster_size=200, method='kmeans', max_workers=None,
+                 seed=0, repair_neighbors=8, **ga_kwargs):
+        """
+        Phân cụm trước, định tuyến sau cho bộ dữ liệu rất lớn (tới ~100k thành phố)
+        - cities: danh sách tọa độ thành phố [[x1,y1], [x2,y2], ...]
+        - cluster_size: số thành phố trung bình mỗi cụm
+        - method: 'kmeans' hoặc 'grid'
+        - max_workers: số tiến trình giải các cụm song song
+        - seed: hạt giống cho phân cụm và GA của từng cụm
+        - repair_neighbors: số láng giềng gần nhất dùng khi sửa đường nối giữa các cụm
+        - ga_kwargs: tham số truyền cho GeneticTSP của mỗi cụm
+        Bộ nhớ tăng tuyến tính theo số thành phố: chỉ có ma trận khoảng cách
+        của từng cụm, không có ma trận n × n.
+        """
+        if method not in ('kmeans', 'grid'):
+            raise ValueError("method phải là 'kmeans' hoặc 'grid'")
+        self.cities = cities
+        self.coords = np.asarray(cities, dtype=np.float64).reshape(-1, 2)
+        self.cluster_size = cluster_size
+        self.method = method
+        self.max_workers = max_workers
+        self.seed = seed
+        self.repair_neighbors = repair_neighbors
+        self.ga_kwargs = ga_kwargs
+        self.timings = {}
+
+    def partition(self):
+        """Nhãn cụm của mỗi thành phố"""
+        if self.method == 'grid':
+            return grid_partition(self.coords, self.cluster_size)
+        return kmeans_partition(self.coords, self.cluster_size, seed=self.seed)
+
+    def order_clusters(self, members):
+        """Thứ tự thăm các cụm: lộ trình ngắn qua các tâm cụm"""
+        centroids = [self.coords[indices].mean(axis=0).tolist() for indices in members]
+        if len(centroids) <= 3:
+            return list(range(len(centroids)))
+        search = LocalSearch(centroids, k=min(8, len(centroids) - 1))
+        return search.optimize(search.nearest_neighbor_tour())
+
+    def dist(self, a, b):
+        """Khoảng cách Euclidean giữa hai thành phố theo chỉ số toàn cục"""
+        return math.hypot(*(self.coords[a] - self.coords[b]))
+
+    def stitch(self, cluster_tours):
+        """Nối các chu trình cụm thành một lộ trình
+
+        Với mỗi cụm, chọn cạnh cắt và chiều đi sao cho tổng độ dài nối từ cuối
+        cụm trước là nhỏ nhất. Trả về lộ trình và các thành phố nằm ở chỗ nối.
+        """
+        route = []
+        boundary = []
+        for tour in cluster_tours:
+            m = len(tour)
+            if not route:
+                # Cụm đầu tiên: cắt cạnh dài nhất
+                cut = max(range(m), key=lambda i: self.dist(tour[i], tour[(i + 1) % m]))
+                path = tour[cut + 1:] + tour[:cut + 1]
+            else:
+                tail = route[-1]
+                best = None
+                for i in range(m):
+                    u, v = tour[i], tour[(i + 1) % m]
+                    edge = self.dist(u, v)
+                    # Vào ở u rồi đi ngược để kết thúc tại v, hoặc vào ở v đi xuôi
+                    for cost, forward in ((self.dist(tail, u) - edge, False),
+                                          (self.dist(tail, v) - edge, True)):
+                        if best is None or cost < best[0]:
+                            best = (cost, i, forward)
+                _, i, forward = best
+                if forward:
+                    path = tour[i + 1:] + tour[:i + 1]
+                else:
+                    path = (tour[i + 1:] + tour[:i + 1])[::-1]
+                boundary.extend([route[-1], path[0]])
+            route.extend(path)
+        if route:
+            boundary.extend([route[-1], route[0]])
+        return route, boundary
+
+    def evolve(self):
+        """Chạy phân cụm, giải từng cụm song song, nối và sửa đường nối"""
+        start = time.perf_counter()
+        labels = self.partition()
+        order = np.argsort(labels, kind='stable')
+        splits = np.cumsum(np.bincount(labels))[:-1]
+        members = np.split(order, splits)
+        self.timings['partition'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cluster_order = self.order_clusters(members)
+        seeds = np.random.SeedSequence(self.seed).generate_state(len(members))
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(_solve_cluster, self.coords[members[c]].tolist(),
+                                       self.ga_kwargs, int(seeds[c]))
+                       for c in cluster_order]
+            cluster_tours = [[int(members[c][i]) for i in future.result()]
+                             for c, future in zip(cluster_order, futures)]
+        self.timings['solve_clusters'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        route, boundary = self.stitch(cluster_tours)
+        self.timings['stitch'] = time.perf_counter() - start
+
+        # Sửa đường nối: 2-opt/Or-opt chỉ bắt đầu từ các thành phố ở chỗ nối
+        # và láng giềng của chúng; don't-look bits lan dần khi có cải thiện
+        start = time.perf_counter()
+        search = LocalSearch(self.cities, k=self.repair_neighbors)
+        active = set(boundary)
+        for city in boundary:
+            active.update(search.neighbors[city])
+        search.optimize(route, active=sorted(active))
+        self.timings['repair'] = time.perf_counter() - start
+
+        return route, search.route_distance(route)
+
+
+def compare_with_monolithic(cities, cluster_size=200, method='kmeans', max_workers=None,
+                            seed=0, **ga_kwargs):
+    """So sánh chất lượng và thời gian với GeneticTSP nguyên khối trên cùng bộ dữ liệu"""
+    start = time.perf_counter()
+    clustered = ClusteredGeneticTSP(cities, cluster_size, method, max_workers, seed,
+                                    **ga_kwargs)
+    _, clustered_distance = clustered.evolve()
+    clustered_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    monolithic = GeneticTSP(cities, seed=seed, **ga_kwargs)
+    _, monolithic_distance = monolithic.evolve(verbose=False)
+    monolithic_time = time.perf_counter() - start
+
+    return {
+        'num_cities': len(cities),
+        'clustered_distance': clustered_distance,
+        'clustered_time': clustered_time,
+        'monolithic_distance': monolithic_distance,
+        'monolithic_time': monolithic_time,
+        'distance_ratio': clustered_distance / monolithic_distance,
+        'speedup': monolithic_time / clustered_time if clustered_time > 0 else None,
+    }
+
+
+# Ví dụ sử dụng
+if __name__ == "__main__":
+    random.seed(42)
+    ga_kwargs = dict(population_size=30, generations=50, elite_size=5,
+                     local_search='elites')
+
+    cities = [[random.uniform(0, 1000), random.uniform(0, 1000)] for _ in range(2000)]
+    print("So sánh với GeneticTSP nguyên khối (2000 thành phố):")
+    for key, value in compare_with_monolithic(cities, **ga_kwargs).items():
+        print(f"  {key}: {value}")
+
+    num_cities = 100000
+    cities = [[random.uniform(0, 10000), random.uniform(0, 10000)] for _ in range(num_cities)]
+    print(f"\nPhân cụm {num_cities} thành phố...")
+    solver = ClusteredGeneticTSP(cities, cluster_size=200, **ga_kwargs)
+    route, distance = solver.evolve()
+    print(f"Khoảng cách tổng cộng: {distance:.1f}")
+    for phase, seconds in solver.timings.items():
+        print(f"  {phase}: {seconds:.1f}s")
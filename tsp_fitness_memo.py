@@ -0,0 +1,106 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+
+def canonical_tours(routes, symmetric=True):
+    """Dạng chuẩn của các lộ trình: xoay để bắt đầu tại thành phố 0 và, với ma trận
+    đối xứng, chọn chiều đi sao cho thành phố thứ hai nhỏ hơn thành phố cuối
+
+    Mọi phép xoay (và đảo chiều nếu đối xứng) của cùng một chu trình cho cùng
+    một hàng kết quả. Tính cho cả quần thể (số cá thể × số thành phố) cùng lúc.
+    """
+    routes = np.asarray(routes, dtype=np.int32)
+    count, size = routes.shape
+    rows = np.arange(count)[:, None]
+    start = np.argmax(routes == 0, axis=1)
+    canonical = routes[rows, (start[:, None] + np.arange(size)) % size]
+    if symmetric and size > 2:
+        flip = canonical[:, 1] > canonical[:, -1]
+        canonical[flip, 1:] = canonical[flip, :0:-1]
+    return canonical
+
+
+def tour_key(canonical_route):
+    """Mã băm 128 bit của một lộ trình dạng chuẩn (kích thước khóa không phụ thuộc n)"""
+    return hashlib.blake2b(canonical_route.tobytes(), digest_size=16).digest()
+
+
+class FitnessMemo:
+    def __init__(self, maxsize=10000, symmetric=True):
+        """
+        Bộ nhớ đệm LRU có giới hạn cho độ dài lộ trình, dùng chung qua các thế hệ
+        - maxsize: số lộ trình tối đa được lưu (mục ít dùng nhất bị loại trước)
+        - symmetric: True nếu ma trận đối xứng - lộ trình và chiều ngược của nó
+          dùng chung một khóa
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize phải lớn hơn 0")
+        self.maxsize = maxsize
+        self.symmetric = symmetric
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def hit_rate(self):
+        """Tỷ lệ tra cứu trúng bộ nhớ đệm (0 nếu chưa tra cứu)"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def keys(self, routes):
+        """Khóa của từng lộ trình trong quần thể"""
+        return [tour_key(route) for route in canonical_tours(routes, self.symmetric)]
+
+    def lookup(self, routes, compute):
+        """Độ dài của các lộ trình, chỉ gọi compute(chỉ số) cho các lộ trình chưa có
+
+        - compute: hàm nhận danh sách chỉ số trong routes, trả về mảng độ dài tương ứng
+        Lộ trình trùng nhau trong cùng một lần gọi chỉ được tính một lần.
+        """
+        keys = self.keys(routes)
+        lengths = np.empty(len(keys), dtype=np.float64)
+        pending = {}
+        for index, key in enumerate(keys):
+            length = self.entries.get(key)
+            if length is not None:
+                self.entries.move_to_end(key)
+                lengths[index] = length
+                self.hits += 1
+            elif key in pending:
+                pending[key].append(index)
+                self.hits += 1
+            else:
+                pending[key] = [index]
+                self.misses += 1
+        if pending:
+            groups = list(pending.values())
+            computed = compute([group[0] for group in groups])
+            for key, group, length in zip(pending, groups, computed):
+                lengths[group] = length
+                self.entries[key] = float(length)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return lengths
+
+    def to_arrays(self):
+        """Khóa (mảng uint8 m × 16) và độ dài theo thứ tự LRU, để lưu checkpoint"""
+        keys = np.frombuffer(b''.join(self.entries), dtype=np.uint8).reshape(-1, 16)
+        return keys, np.fromiter(self.entries.values(), dtype=np.float64, count=len(self.entries))
+
+    def load_arrays(self, keys, lengths, hits=0, misses=0):
+        """Khôi phục bộ nhớ đệm từ kết quả của to_arrays"""
+        self.entries = OrderedDict(
+            (key.tobytes(), float(length)) for key, length in zip(keys, lengths))
+        self.hits = hits
+        self.misses = misses
+
+    def clear(self):
+        """Xóa bộ nhớ đệm và bộ đếm"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
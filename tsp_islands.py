@@ -0,0 +1,179 @@
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from nguoidulich import GeneticTSP
+
+# Trạng thái riêng của mỗi tiến trình worker (khởi tạo một lần qua initializer)
+_worker_shm = None
+_worker_ga = None
+
+
+def _init_worker(shm_name, shape, dtype, cities, ga_kwargs):
+    """Gắn worker vào ma trận khoảng cách trong bộ nhớ dùng chung"""
+    global _worker_shm, _worker_ga
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    matrix = np.ndarray(shape, dtype=dtype, buffer=_worker_shm.buf)
+    _worker_ga = GeneticTSP(cities, distance_matrix=matrix, **ga_kwargs)
+
+
+def _run_epoch(population, lengths, rng_state, num_generations):
+    """Tiến hóa một đảo trong num_generations thế hệ
+    - lengths: khoảng cách đã biết của quần thể (None hoặc NaN = tính lại)
+
+    Trả về quần thể mới, khoảng cách của nó, trạng thái RNG và lịch sử
+    """
+    ga = _worker_ga
+    ga.rng = random.Random()
+    ga.rng.setstate(rng_state)
+    best_history, avg_history = [], []
+    for _ in range(num_generations):
+        distances = ga.score_population(population, lengths)
+        best_history.append(float(distances.min()))
+        avg_history.append(float(distances.mean()))
+        population, lengths = ga.next_generation_cached(population, distances)
+    distances = ga.score_population(population, lengths)
+    return population, distances, ga.rng.getstate(), best_history, avg_history
+
+
+class IslandGeneticTSP:
+    def __init__(self, cities, num_islands=4, migration_interval=20, migration_size=2,
+                 topology='ring', max_workers=None, seed=None, **ga_kwargs):
+        """
+        Giải thuật di truyền mô hình đảo chạy song song trên nhiều tiến trình
+        - cities: danh sách tọa độ thành phố [[x1,y1], [x2,y2], ...]
+        - num_islands: số quần thể con (đảo)
+        - migration_interval: số thế hệ giữa hai lần trao đổi cá thể ưu tú
+        - migration_size: số cá thể ưu tú mỗi đảo gửi đi
+        - topology: 'ring' (vòng) hoặc 'full' (kết nối đầy đủ)
+        - max_workers: số tiến trình (None = bằng số đảo)
+        - seed: hạt giống gốc, mỗi đảo nhận một luồng ngẫu nhiên riêng
+        - ga_kwargs: tham số truyền cho GeneticTSP của mỗi đảo (chỉ engine='list')
+        """
+        if topology not in ('ring', 'full'):
+            raise ValueError("topology phải là 'ring' hoặc 'full'")
+        if ga_kwargs.get('engine', 'list') != 'list':
+            raise ValueError("Mô hình đảo chỉ hỗ trợ engine='list'")
+        self.cities = cities
+        self.num_islands = num_islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.topology = topology
+        self.max_workers = max_workers or num_islands
+        self.seed = seed
+        self.ga_kwargs = ga_kwargs
+        self.ga = GeneticTSP(cities, **ga_kwargs)
+        self.best_fitness_history = []
+        self.avg_fitness_history = []
+
+    def island_seeds(self):
+        """Sinh hạt giống độc lập cho từng đảo từ hạt giống gốc"""
+        children = np.random.SeedSequence(self.seed).spawn(self.num_islands)
+        return [int(child.generate_state(1, dtype=np.uint64)[0]) for child in children]
+
+    def neighbors(self, island):
+        """Danh sách đảo nhận cá thể di cư từ island theo topology"""
+        if self.topology == 'ring':
+            return [(island + 1) % self.num_islands] if self.num_islands > 1 else []
+        return [other for other in range(self.num_islands) if other != island]
+
+    def migrate(self, populations, distances):
+        """Gửi cá thể ưu tú sang các đảo láng giềng, thay thế cá thể kém nhất"""
+        migrants = []
+        for island in range(self.num_islands):
+            ranked = np.argsort(distances[island], kind='stable')
+            migrants.append([(list(populations[island][i]), distances[island][i])
+                             for i in ranked[:self.migration_size]])
+
+        for island in range(self.num_islands):
+            incoming = [migrant for source in range(self.num_islands)
+                        if island in self.neighbors(source)
+                        for migrant in migrants[source]]
+            worst = np.argsort(distances[island], kind='stable')[::-1]
+            for slot, (route, distance) in zip(worst, incoming):
+                populations[island][slot] = route
+                distances[island][slot] = distance
+
+    def evolve(self, verbose=True):
+        """Chạy mô hình đảo, trả về lộ trình tốt nhất và khoảng cách của nó
+        - verbose: in khoảng cách tốt nhất sau mỗi 100 thế hệ
+        """
+        populations = []
+        distances = [None] * self.num_islands
+        rng_states = []
+        for island_seed in self.island_seeds():
+            self.ga.rng = random.Random(island_seed)
+            populations.append(self.ga.create_population())
+            rng_states.append(self.ga.rng.getstate())
+
+        matrix = self.ga.distance_matrix
+        shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+        try:
+            np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=shm.buf)[:] = matrix
+            worker_kwargs = {key: value for key, value in self.ga_kwargs.items()
+                             if key not in ('distance_matrix', 'seed')}
+            with ProcessPoolExecutor(
+                    max_workers=self.max_workers, initializer=_init_worker,
+                    initargs=(shm.name, matrix.shape, matrix.dtype, self.cities,
+                              worker_kwargs)) as executor:
+                num_epochs = math.ceil(self.ga.generations / self.migration_interval)
+                for epoch in range(num_epochs):
+                    done = epoch * self.migration_interval
+                    steps = min(self.migration_interval, self.ga.generations - done)
+                    # Độ dài của quần thể (kể cả cá thể di cư) đã biết từ epoch trước
+                    futures = [executor.submit(_run_epoch, populations[i], distances[i],
+                                               rng_states[i], steps)
+                               for i in range(self.num_islands)]
+                    results = [future.result() for future in futures]
+
+                    populations = [result[0] for result in results]
+                    distances = [result[1] for result in results]
+                    rng_states = [result[2] for result in results]
+                    self.best_fitness_history.extend(
+                        np.min([result[3] for result in results], axis=0).tolist())
+                    self.avg_fitness_history.extend(
+                        np.mean([result[4] for result in results], axis=0).tolist())
+
+                    if epoch < num_epochs - 1:
+                        self.migrate(populations, distances)
+
+                    generation = done + steps
+                    if verbose and (generation % 100 < steps
+                                    or generation == self.ga.generations):
+                        print(f"Thế hệ {generation}: Khoảng cách tốt nhất = "
+                              f"{self.best_fitness_history[-1]:.2f}")
+        finally:
+            shm.close()
+            shm.unlink()
+
+        best_island = min(range(self.num_islands), key=lambda i: distances[i].min())
+        best_index = int(np.argmin(distances[best_island]))
+        return list(populations[best_island][best_index]), float(distances[best_island][best_index])
+
+    def visualize(self, route, title="Lộ trình TSP (mô hình đảo)", save_path=None, show=True):
+        """Hiển thị lộ trình tốt nhất cùng lịch sử hội tụ gộp của các đảo"""
+        self.ga.best_fitness_history = self.best_fitness_history
+        self.ga.avg_fitness_history = self.avg_fitness_history
+        return self.ga.visualize(route, title, save_path, show)
+
+
+# Ví dụ sử dụng
+if __name__ == "__main__":
+    random.seed(42)
+    num_cities = 100
+    cities = [[random.uniform(0, 100), random.uniform(0, 100)]
+              for _ in range(num_cities)]
+
+    islands = IslandGeneticTSP(cities, num_islands=4, migration_interval=25,
+                               topology='ring', seed=42, population_size=100,
+                               generations=500, mutation_rate=0.02, elite_size=20)
+
+    print("Đang chạy giải thuật di truyền mô hình đảo...")
+    best_route, best_distance = islands.evolve()
+
+    print(f"\nKết quả tốt nhất:")
+    print(f"Lộ trình: {best_route}")
+    print(f"Khoảng cách tổng cộng: {best_distance:.2f}")
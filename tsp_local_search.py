@@ -0,0 +1,285 @@
+import math
+import random
+from collections import deque
+
+import numpy as np
+
+
+def build_neighbor_lists(cities, k=8):
+    """Danh sách k láng giềng gần nhất của mỗi thành phố bằng lưới không gian
+
+    Mỗi thành phố chỉ xét các ô lưới xung quanh (mở rộng dần từng vòng)
+    thay vì quét toàn bộ O(n²). Kết quả sắp xếp theo khoảng cách tăng dần.
+    """
+    coords = np.asarray(cities, dtype=np.float64).reshape(-1, 2)
+    n = len(coords)
+    k = min(k, n - 1)
+    if k <= 0:
+        return [[] for _ in range(n)]
+
+    low = coords.min(axis=0)
+    span = np.maximum(coords.max(axis=0) - low, 1e-12)
+    # Trung bình khoảng 2 thành phố mỗi ô
+    cell = math.sqrt(span[0] * span[1] * 2 / n) or float(span.max())
+    cells = np.floor((coords - low) / cell).astype(np.int64)
+    grid = {}
+    for index, (cx, cy) in enumerate(cells.tolist()):
+        grid.setdefault((cx, cy), []).append(index)
+    max_ring = int(max(cells.max(axis=0))) + 1
+
+    neighbors = []
+    for index in range(n):
+        cx, cy = cells[index]
+        candidates = []
+        ring = 0
+        while True:
+            # Thêm các ô nằm đúng trên vòng thứ ring
+            for x in range(cx - ring, cx + ring + 1):
+                for y in range(cy - ring, cy + ring + 1):
+                    if max(abs(x - cx), abs(y - cy)) == ring:
+                        candidates.extend(grid.get((x, y), ()))
+            if len(candidates) > k:
+                found = np.asarray(candidates)
+                found = found[found != index]
+                d = np.hypot(*(coords[found] - coords[index]).T)
+                order = np.argsort(d, kind='stable')[:k]
+                # Mọi điểm trong bán kính ring*cell đều đã nằm trong các ô đã xét
+                if d[order[-1]] <= ring * cell or ring > max_ring:
+                    neighbors.append(found[order].tolist())
+                    break
+            ring += 1
+    return neighbors
+
+
+def neighbor_lists_from_matrix(matrix, k=8):
+    """Danh sách k láng giềng gần nhất của mỗi thành phố theo từng hàng của ma
+    trận khoảng cách (sắp xếp theo khoảng cách tăng dần)"""
+    matrix = np.asarray(matrix)
+    n = len(matrix)
+    k = min(k, n - 1)
+    if k <= 0:
+        return [[] for _ in range(n)]
+    neighbors = []
+    for index in range(n):
+        row = matrix[index].astype(np.float64)
+        row[index] = np.inf
+        nearest = np.argpartition(row, k - 1)[:k]
+        neighbors.append(nearest[np.argsort(row[nearest], kind='stable')].tolist())
+    return neighbors
+
+
+class LocalSearch:
+    def __init__(self, cities=None, k=8, distance_matrix=None):
+        """
+        Tìm kiếm cục bộ 2-opt / Or-opt trên danh sách k láng giềng gần nhất
+        - cities: danh sách tọa độ thành phố [[x1,y1], [x2,y2], ...]
+        - k: số láng giềng ứng viên của mỗi thành phố
+        - distance_matrix: ma trận khoảng cách đối xứng; nếu có, láng giềng và mọi
+          phép tính khoảng cách dùng ma trận này thay cho tọa độ Euclidean
+        """
+        if distance_matrix is not None:
+            self.matrix = np.asarray(distance_matrix)
+            self.num_cities = len(self.matrix)
+            self.neighbors = neighbor_lists_from_matrix(self.matrix, k)
+            # Tra trực tiếp ma trận (trả về số Python) thay cho Euclidean
+            self.dist = self.matrix.item
+        elif cities is not None:
+            self.matrix = None
+            self.xs = [float(city[0]) for city in cities]
+            self.ys = [float(city[1]) for city in cities]
+            self.num_cities = len(cities)
+            self.neighbors = build_neighbor_lists(cities, k)
+        else:
+            raise ValueError("Cần tọa độ thành phố hoặc ma trận khoảng cách")
+        self.moves = 0
+
+    def dist(self, a, b):
+        """Khoảng cách Euclidean giữa hai thành phố theo chỉ số (khi có ma trận
+        khoảng cách, thuộc tính self.dist được thay bằng phép tra ma trận)"""
+        return math.hypot(self.xs[a] - self.xs[b], self.ys[a] - self.ys[b])
+
+    def route_distance(self, route):
+        """Tổng khoảng cách của một lộ trình"""
+        return sum(self.dist(route[i - 1], route[i]) for i in range(len(route)))
+
+    def nearest_neighbor_tour(self, start=0):
+        """Lộ trình tham lam láng giềng gần nhất, dùng làm điểm xuất phát"""
+        n = self.num_cities
+        visited = bytearray(n)
+        remaining = set(range(n))
+        tour = [start]
+        visited[start] = 1
+        remaining.discard(start)
+        current = start
+        while remaining:
+            nxt = next((c for c in self.neighbors[current] if not visited[c]), None)
+            if nxt is None:
+                nxt = min(remaining, key=lambda c: self.dist(current, c))
+            tour.append(nxt)
+            visited[nxt] = 1
+            remaining.discard(nxt)
+            current = nxt
+        return tour
+
+    def _reverse(self, tour, pos, i, j):
+        """Đảo đoạn tour[i..j] (theo chiều tiến, có thể quấn vòng)"""
+        n = len(tour)
+        length = (j - i) % n + 1
+        # Đảo phần bù nếu ngắn hơn - lộ trình vòng vẫn tương đương
+        if length * 2 > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+        for _ in range(length // 2):
+            a, b = tour[i], tour[j]
+            tour[i], tour[j] = b, a
+            pos[b], pos[a] = i, j
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    def two_opt(self, route, active=None):
+        """2-opt với danh sách láng giềng và don't-look bits (sửa tại chỗ)
+        - active: các thành phố bắt đầu xét (None = tất cả); thành phố khác chỉ
+          được xét lại khi một cạnh kề nó thay đổi
+        """
+        n = len(route)
+        if n < 5:
+            return route
+        pos = [0] * n
+        for index, city in enumerate(route):
+            pos[city] = index
+        dist = self.dist
+        queue = deque(route if active is None else active)
+        in_queue = bytearray(n)
+        for city in queue:
+            in_queue[city] = 1
+
+        while queue:
+            a = queue.popleft()
+            in_queue[a] = 0
+            improved = False
+            for forward in (True, False):
+                i = pos[a]
+                a_next = route[(i + 1) % n] if forward else route[i - 1]
+                d_a = dist(a, a_next)
+                for c in self.neighbors[a]:
+                    d_ac = dist(a, c)
+                    if d_ac >= d_a:
+                        break
+                    j = pos[c]
+                    c_next = route[(j + 1) % n] if forward else route[j - 1]
+                    if c_next == a or c == a_next:
+                        continue
+                    delta = d_ac + dist(a_next, c_next) - d_a - dist(c, c_next)
+                    if delta < -1e-10:
+                        if forward:
+                            self._reverse(route, pos, (i + 1) % n, j)
+                        else:
+                            self._reverse(route, pos, i, (j - 1) % n)
+                        self.moves += 1
+                        for city in (a, a_next, c, c_next):
+                            if not in_queue[city]:
+                                in_queue[city] = 1
+                                queue.append(city)
+                        improved = True
+                        break
+                if improved:
+                    break
+        return route
+
+    def or_opt(self, route, max_segment=3, active=None):
+        """Or-opt: dời đoạn 1..max_segment thành phố tới cạnh gần láng giềng
+        - active: chỉ xét các đoạn bắt đầu từ những thành phố này (None = tất cả)
+
+        Trả về True nếu có ít nhất một bước cải thiện.
+        """
+        n = len(route)
+        if n < 8:
+            return False
+        dist = self.dist
+        any_improved = False
+        pos = [0] * n
+        for index, city in enumerate(route):
+            pos[city] = index
+
+        for start_city in list(route if active is None else active):
+            for length in range(1, max_segment + 1):
+                i = pos[start_city]
+                segment = [route[(i + s) % n] for s in range(length)]
+                first, last = segment[0], segment[-1]
+                prev_city = route[i - 1]
+                next_city = route[(i + length) % n]
+                removed_gain = (dist(prev_city, first) + dist(last, next_city)
+                                - dist(prev_city, next_city))
+                if removed_gain <= 1e-10:
+                    continue
+                in_segment = set(segment)
+                best = None
+                for end_city, other in ((first, last), (last, first)):
+                    for c in self.neighbors[end_city]:
+                        if dist(end_city, c) >= removed_gain:
+                            break
+                        if c in in_segment:
+                            continue
+                        # Chèn giữa c và một trong hai láng giềng trên tour của c
+                        j = pos[c]
+                        for d in (route[(j + 1) % n], route[j - 1]):
+                            if d in in_segment:
+                                continue
+                            added = dist(c, end_city) + dist(other, d) - dist(c, d)
+                            gain = removed_gain - added
+                            if gain > 1e-10 and (best is None or gain > best[0]):
+                                best = (gain, c, d, end_city)
+                if best is None:
+                    continue
+
+                _, c, d, end_city = best
+                # Dựng lại lộ trình: bỏ đoạn ra rồi chèn vào giữa c và d,
+                # end_city nối với c và đầu còn lại nối với d
+                if i + length <= n:
+                    rest = route[i + length:] + route[:i]
+                else:
+                    rest = route[(i + length) % n:i]
+                k = rest.index(c)
+                if rest[(k + 1) % len(rest)] == d:
+                    piece = segment if end_city == first else segment[::-1]
+                    new_route = rest[:k + 1] + piece + rest[k + 1:]
+                else:
+                    piece = segment if end_city == last else segment[::-1]
+                    new_route = rest[:k] + piece + rest[k:]
+                route[:] = new_route
+                for index, city in enumerate(route):
+                    pos[city] = index
+                self.moves += 1
+                any_improved = True
+                break
+        return any_improved
+
+    def optimize(self, route, max_rounds=50, active=None):
+        """Xen kẽ 2-opt và Or-opt đến khi không còn cải thiện (sửa tại chỗ)
+        - active: giới hạn điểm bắt đầu tìm kiếm như trong two_opt / or_opt
+        """
+        for _ in range(max_rounds):
+            self.two_opt(route, active)
+            if not self.or_opt(route, active=active):
+                break
+        return route
+
+
+# Ví dụ sử dụng
+if __name__ == "__main__":
+    import time
+
+    random.seed(42)
+    num_cities = 10000
+    cities = [[random.uniform(0, 1000), random.uniform(0, 1000)]
+              for _ in range(num_cities)]
+
+    start = time.perf_counter()
+    search = LocalSearch(cities, k=8)
+    print(f"Danh sách láng giềng: {time.perf_counter() - start:.1f}s")
+
+    route = search.nearest_neighbor_tour()
+    print(f"Láng giềng gần nhất: {search.route_distance(route):.1f}")
+    search.optimize(route)
+    print(f"Sau 2-opt + Or-opt: {search.route_distance(route):.1f} "
+          f"({search.moves} bước, {time.perf_counter() - start:.1f}s)")
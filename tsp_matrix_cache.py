@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+# Thư mục cache mặc định, có thể đổi bằng biến môi trường TSP_MATRIX_CACHE
+DEFAULT_CACHE_DIR = os.environ.get(
+    'TSP_MATRIX_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'tsp_matrices'))
+
+COMPACT_DTYPES = (np.float32, np.float64, np.uint32)
+
+
+def euclidean_matrix(cities):
+    """Bộ dựng mặc định: khoảng cách Euclidean giữa mọi cặp thành phố"""
+    coords = np.asarray(cities, dtype=np.float64).reshape(-1, 2)
+    diff = coords[:, None, :] - coords[None, :, :]
+    return np.sqrt((diff ** 2).sum(axis=2))
+
+
+def to_compact(matrix, dtype):
+    """Chuyển ma trận sang kiểu lưu trữ gọn
+
+    uint32 dùng cho thời gian di chuyển tính bằng giây: làm tròn và chặn
+    trong khoảng [0, 2^32 - 1].
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in COMPACT_DTYPES:
+        raise ValueError("dtype phải là float32, float64 hoặc uint32")
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if dtype == np.uint32:
+        return np.clip(np.rint(matrix), 0, np.iinfo(np.uint32).max).astype(np.uint32)
+    return matrix.astype(dtype)
+
+
+class DistanceMatrixCache:
+    def __init__(self, cache_dir=None):
+        """
+        Cache ma trận khoảng cách trên đĩa, định danh bằng mã băm nội dung đầu vào
+        - cache_dir: thư mục lưu các file .npy (mặc định DEFAULT_CACHE_DIR)
+        Ma trận đã có trong cache được mở bằng memory-map thay vì dựng lại.
+        """
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, cities, builder_name, dtype, params=None):
+        """Mã băm SHA-256 của tọa độ, tên bộ dựng, kiểu lưu trữ và tham số"""
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(cities, dtype=np.float64).tobytes())
+        header = {'builder': builder_name, 'dtype': np.dtype(dtype).str,
+                  'shape': list(np.shape(cities)), 'params': params or {}}
+        digest.update(json.dumps(header, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def path(self, key):
+        """Đường dẫn file của một mục trong cache"""
+        return os.path.join(self.cache_dir, f'{key}.npy')
+
+    def get_or_build(self, cities, builder=euclidean_matrix, dtype=np.float32,
+                     builder_name=None, **params):
+        """Trả về ma trận (np.memmap chỉ đọc) từ cache, dựng và lưu nếu chưa có
+        - builder: hàm builder(cities, **params) -> ma trận n × n (có thể bất đối xứng)
+        - dtype: kiểu lưu trữ (float32, float64 hoặc uint32 giây)
+        - builder_name: tên dùng trong mã băm (mặc định module.tên_hàm của builder)
+        """
+        builder_name = builder_name or f'{builder.__module__}.{builder.__qualname__}'
+        path = self.path(self.key(cities, builder_name, dtype, params))
+        if os.path.exists(path):
+            self.hits += 1
+            return np.load(path, mmap_mode='r')
+
+        self.misses += 1
+        matrix = to_compact(builder(cities, **params), dtype)
+        n = len(cities)
+        if matrix.shape != (n, n):
+            raise ValueError(f"Bộ dựng trả về ma trận {matrix.shape}, cần ({n}, {n})")
+
+        # Ghi ra file tạm rồi đổi tên nguyên tử để tiến trình khác không đọc file dở
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, matrix)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return np.load(path, mmap_mode='r')
+
+    def clear(self):
+        """Xóa mọi ma trận trong cache"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.npy'):
+                os.remove(os.path.join(self.cache_dir, name))
+
+
+def cached_distance_matrix(cities, builder=euclidean_matrix, dtype=np.float32,
+                           cache_dir=None, **params):
+    """Lối tắt: lấy ma trận từ cache mặc định (hoặc cache_dir), dựng nếu chưa có"""
+    return DistanceMatrixCache(cache_dir).get_or_build(cities, builder, dtype, **params)
+
+
+# Ví dụ sử dụng
+if __name__ == "__main__":
+    import random
+    import time
+
+    from nguoidulich import GeneticTSP
+
+    def travel_seconds(cities, speed_kmh=40.0, one_way_penalty=1.2):
+        """Thời gian di chuyển giả lập (giây) - bất đối xứng: chiều 'lên' chậm hơn"""
+        coords = np.asarray(cities, dtype=np.float64)
+        km = euclidean_matrix(cities)
+        uphill = coords[None, :, 1] > coords[:, None, 1]
+        return km / speed_kmh * 3600 * np.where(uphill, one_way_penalty, 1.0)
+
+    random.seed(42)
+    cities = [[random.uniform(0, 50), random.uniform(0, 50)] for _ in range(300)]
+    cache = DistanceMatrixCache()
+    for attempt in range(2):
+        start = time.perf_counter()
+        matrix = cache.get_or_build(cities, travel_seconds, dtype=np.uint32)
+        print(f"Lần {attempt + 1}: {time.perf_counter() - start:.4f}s "
+              f"(hit={cache.hits}, miss={cache.misses}, kiểu={matrix.dtype})")
+
+    ga = GeneticTSP(cities, distance_matrix=matrix, generations=200)
+    route, seconds = ga.evolve(verbose=False)
+    print(f"Thời gian lộ trình tốt nhất: {seconds / 3600:.2f} giờ")
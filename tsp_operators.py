@@ -0,0 +1,248 @@
+import random
+import time
+
+# Các toán tử lai ghép và đột biến cho GeneticTSP, chọn theo tên.
+# Lai ghép: f(parent1, parent2, rng) -> child (list mới)
+# Đột biến: f(route, rng) -> route (sửa tại chỗ)
+# Bước đột biến: (apply(route, i, j), delta(route, i, j, matrix)) với i, j là hai
+# vị trí khác nhau; delta tính độ thay đổi độ dài O(1) trước khi áp dụng
+CROSSOVER_OPERATORS = {}
+MUTATION_OPERATORS = {}
+MUTATION_MOVES = {}
+
+
+def register_crossover(name):
+    """Decorator đăng ký một toán tử lai ghép theo tên"""
+    def decorator(func):
+        CROSSOVER_OPERATORS[name] = func
+        return func
+    return decorator
+
+
+def register_mutation(name, apply=None, delta=None):
+    """Decorator đăng ký một toán tử đột biến theo tên
+
+    - apply, delta: bước đột biến tại hai vị trí cho trước và độ thay đổi độ dài
+      tương ứng, cho phép cập nhật độ dài đã lưu mà không tính lại từ đầu
+    """
+    def decorator(func):
+        MUTATION_OPERATORS[name] = func
+        if apply is not None and delta is not None:
+            MUTATION_MOVES[name] = (apply, delta)
+        return func
+    return decorator
+
+
+def get_crossover(name):
+    """Lấy toán tử lai ghép theo tên"""
+    if name not in CROSSOVER_OPERATORS:
+        raise ValueError(f"Không có toán tử lai ghép '{name}', "
+                         f"chọn một trong {sorted(CROSSOVER_OPERATORS)}")
+    return CROSSOVER_OPERATORS[name]
+
+
+def get_mutation(name):
+    """Lấy toán tử đột biến theo tên"""
+    if name not in MUTATION_OPERATORS:
+        raise ValueError(f"Không có toán tử đột biến '{name}', "
+                         f"chọn một trong {sorted(MUTATION_OPERATORS)}")
+    return MUTATION_OPERATORS[name]
+
+
+@register_crossover('ox')
+def order_crossover(parent1, parent2, rng=random):
+    """Order Crossover (OX) O(n): dùng bitmap đánh dấu thành phố đã có"""
+    size = len(parent1)
+    start, end = sorted(rng.sample(range(size), 2))
+
+    child = [-1] * size
+    child[start:end] = parent1[start:end]
+    taken = bytearray(size)
+    for city in parent1[start:end]:
+        taken[city] = 1
+
+    pointer = end
+    for city in parent2[end:] + parent2[:end]:
+        if not taken[city]:
+            if pointer >= size:
+                pointer = 0
+            child[pointer] = city
+            pointer += 1
+
+    return child
+
+
+@register_crossover('pmx')
+def pmx_crossover(parent1, parent2, rng=random):
+    """Partially Mapped Crossover (PMX) O(n): hoán đổi theo bảng vị trí"""
+    size = len(parent1)
+    start, end = sorted(rng.sample(range(size), 2))
+
+    child = list(parent2)
+    position = [0] * size
+    for index, city in enumerate(child):
+        position[city] = index
+
+    # Đưa từng thành phố trong đoạn của parent1 về đúng vị trí bằng một phép hoán đổi
+    for i in range(start, end):
+        city = parent1[i]
+        j = position[city]
+        displaced = child[i]
+        child[i], child[j] = city, displaced
+        position[city], position[displaced] = i, j
+
+    return child
+
+
+@register_crossover('erx')
+def edge_recombination_crossover(parent1, parent2, rng=random):
+    """Edge Recombination Crossover (ERX) O(n): giữ tối đa cạnh của cha mẹ"""
+    size = len(parent1)
+    neighbors = [set() for _ in range(size)]
+    for parent in (parent1, parent2):
+        for i, city in enumerate(parent):
+            neighbors[city].add(parent[i - 1])
+            neighbors[city].add(parent[(i + 1) % size])
+
+    # Danh sách thành phố chưa thăm, xóa O(1) bằng cách hoán đổi với phần tử cuối
+    unvisited = list(range(size))
+    slot = list(range(size))
+
+    def visit(city):
+        index = slot[city]
+        last = unvisited[-1]
+        unvisited[index], slot[last] = last, index
+        unvisited.pop()
+        slot[city] = -1
+        for neighbor in neighbors[city]:
+            neighbors[neighbor].discard(city)
+
+    city = parent1[0]
+    child = [city]
+    visit(city)
+    while unvisited:
+        candidates = neighbors[city]
+        if candidates:
+            fewest = min(len(neighbors[c]) for c in candidates)
+            best = [c for c in candidates if len(neighbors[c]) == fewest]
+            city = best[0] if len(best) == 1 else rng.choice(sorted(best))
+        else:
+            city = unvisited[rng.randrange(len(unvisited))]
+        child.append(city)
+        visit(city)
+
+    return child
+
+
+def apply_inversion(route, i, j):
+    """Đảo ngược đoạn route[i..j] (i, j theo thứ tự bất kỳ)"""
+    start, end = sorted((i, j))
+    route[start:end+1] = reversed(route[start:end+1])
+    return route
+
+
+def inversion_delta(route, i, j, matrix):
+    """Độ thay đổi độ dài khi đảo đoạn - chỉ hai cạnh đổi (ma trận đối xứng)"""
+    n = len(route)
+    start, end = sorted((i, j))
+    if end - start + 1 >= n - 1:
+        return 0.0
+    prev_city, next_city = route[start - 1], route[(end + 1) % n]
+    first, last = route[start], route[end]
+    # item() trả về số Python - tránh tràn số khi ma trận là uint32
+    d = matrix.item
+    return float(d(prev_city, last) + d(first, next_city) - d(prev_city, first) - d(last, next_city))
+
+
+def apply_swap(route, i, j):
+    """Hoán đổi hai thành phố tại vị trí i và j"""
+    route[i], route[j] = route[j], route[i]
+    return route
+
+
+def swap_delta(route, i, j, matrix):
+    """Độ thay đổi độ dài khi hoán đổi - chỉ tính các cạnh kề i và j"""
+    n = len(route)
+
+    def city_after_swap(k):
+        return route[j] if k == i else route[i] if k == j else route[k]
+
+    d = matrix.item
+    edges = {(i - 1) % n, i, (j - 1) % n, j}
+    before = sum(d(route[k], route[(k + 1) % n]) for k in edges)
+    after = sum(d(city_after_swap(k), city_after_swap((k + 1) % n)) for k in edges)
+    return float(after - before)
+
+
+def apply_insertion(route, i, j):
+    """Lấy thành phố ở vị trí i ra và chèn vào vị trí j"""
+    route.insert(j, route.pop(i))
+    return route
+
+
+def insertion_delta(route, i, j, matrix):
+    """Độ thay đổi độ dài khi chèn: bỏ hai cạnh quanh i, tách một cạnh ở j"""
+    n = len(route)
+    city = route[i]
+    prev_city, next_city = route[i - 1], route[(i + 1) % n]
+
+    def city_after_pop(k):
+        k %= n - 1
+        return route[k] if k < i else route[k + 1]
+
+    d = matrix.item
+    before, after = city_after_pop(j - 1), city_after_pop(j)
+    return float(d(prev_city, next_city) - d(prev_city, city) - d(city, next_city)
+                 + d(before, city) + d(city, after) - d(before, after))
+
+
+@register_mutation('inversion', apply_inversion, inversion_delta)
+def inversion_mutation(route, rng=random):
+    """Đột biến đảo ngược một đoạn ngẫu nhiên"""
+    i, j = rng.sample(range(len(route)), 2)
+    return apply_inversion(route, i, j)
+
+
+@register_mutation('swap', apply_swap, swap_delta)
+def swap_mutation(route, rng=random):
+    """Đột biến hoán đổi hai thành phố ngẫu nhiên"""
+    i, j = rng.sample(range(len(route)), 2)
+    return apply_swap(route, i, j)
+
+
+@register_mutation('insertion', apply_insertion, insertion_delta)
+def insertion_mutation(route, rng=random):
+    """Đột biến chèn: lấy một thành phố ra và chèn vào vị trí khác"""
+    i, j = rng.sample(range(len(route)), 2)
+    return apply_insertion(route, i, j)
+
+
+def benchmark_operators(num_cities=2000, repeats=200, seed=0):
+    """Đo thông lượng (số lần gọi/giây) của từng toán tử đã đăng ký"""
+    rng = random.Random(seed)
+    parents = []
+    for _ in range(2):
+        route = list(range(num_cities))
+        rng.shuffle(route)
+        parents.append(route)
+
+    results = {}
+    for name, operator in CROSSOVER_OPERATORS.items():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            operator(parents[0], parents[1], rng)
+        results[f'crossover:{name}'] = repeats / (time.perf_counter() - start)
+    for name, operator in MUTATION_OPERATORS.items():
+        route = list(parents[0])
+        start = time.perf_counter()
+        for _ in range(repeats):
+            operator(route, rng)
+        results[f'mutation:{name}'] = repeats / (time.perf_counter() - start)
+    return results
+
+
+if __name__ == "__main__":
+    num_cities = 2000
+    print(f"Thông lượng toán tử với {num_cities} thành phố:")
+    for name, throughput in benchmark_operators(num_cities).items():
+        print(f"  {name:<20} {throughput:>12.1f} lần/giây")
@@ -0,0 +1,147 @@
+import functools
+import json
+import os
+import threading
+from time import perf_counter_ns
+
+# Các pha của GeneticTSP và phương thức đo cho mỗi pha (engine 'list' và 'array');
+# pha 'breeding' bao gồm selection/crossover/mutation/local_search bên trong nó
+PROFILED_PHASES = {
+    'evaluation': ('score_population',),
+    'breeding': ('next_generation_cached', 'next_generation_array'),
+    'selection': ('selection_indices', 'selection_batch'),
+    'crossover': ('crossover', 'crossover_batch'),
+    'mutation': ('mutate_cached', 'mutate_batch'),
+    'local_search': ('apply_local_search',),
+    'adaptation': ('adapt',),
+    'exact': ('solve_exact',),
+}
+
+
+class PhaseProfiler:
+    def __init__(self, record_events=True, max_events=200000):
+        """
+        Đo thời gian và số lần gọi theo pha bằng perf_counter_ns
+        - record_events: lưu từng lần gọi để xuất Chrome trace-event JSON
+        - max_events: số sự kiện tối đa được lưu (phần vượt chỉ được cộng vào tổng)
+        Chỉ tốn chi phí khi đã gắn vào một GeneticTSP bằng instrument(); đối tượng
+        không được gắn chạy đúng mã gốc, không có kiểm tra cờ nào trong vòng lặp.
+        """
+        self.record_events = record_events
+        self.max_events = max_events
+        self.stats = {}
+        self.events = []
+        self.dropped_events = 0
+        self.origin_ns = perf_counter_ns()
+        self._stack = []
+
+    def wrap(self, phase, func):
+        """Bọc func để cộng thời gian (gồm và không gồm pha con) vào phase"""
+        stats = self.stats.setdefault(phase, [0, 0, 0])  # số lần gọi, tổng ns, ns của pha con
+        stack = self._stack
+        events = self.events
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            stack.append(0)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = perf_counter_ns() - start
+                stats[0] += 1
+                stats[1] += duration
+                stats[2] += stack.pop()
+                if stack:
+                    stack[-1] += duration
+                if self.record_events:
+                    if len(events) < self.max_events:
+                        events.append((phase, start, duration))
+                    else:
+                        self.dropped_events += 1
+        timed.__wrapped_phase__ = phase
+        return timed
+
+    def instrument(self, ga):
+        """Gắn bộ đo vào các phương thức của một GeneticTSP (thuộc tính của đối tượng)"""
+        for phase, names in PROFILED_PHASES.items():
+            for name in names:
+                method = getattr(ga, name)
+                if not hasattr(method, '__wrapped_phase__'):
+                    setattr(ga, name, self.wrap(phase, method))
+        return ga
+
+    @staticmethod
+    def uninstrument(ga):
+        """Gỡ bộ đo, trả các phương thức về bản gốc của lớp"""
+        for names in PROFILED_PHASES.values():
+            for name in names:
+                if hasattr(ga.__dict__.get(name), '__wrapped_phase__'):
+                    delattr(ga, name)
+        return ga
+
+    def reset(self):
+        """Xóa số liệu đã đo"""
+        for stats in self.stats.values():
+            stats[:] = [0, 0, 0]
+        self.events.clear()
+        self.dropped_events = 0
+        self.origin_ns = perf_counter_ns()
+
+    def results(self):
+        """Số liệu theo pha: số lần gọi, tổng thời gian (ns), thời gian riêng không
+        gồm pha con (ns) và thời gian trung bình mỗi lần gọi (ns)"""
+        return {
+            phase: {
+                'calls': calls,
+                'total_ns': total,
+                'self_ns': total - children,
+                'mean_ns': total / calls if calls else 0.0,
+            }
+            for phase, (calls, total, children) in self.stats.items() if calls
+        }
+
+    def chrome_trace(self):
+        """Các sự kiện dạng Chrome trace-event (mở bằng chrome://tracing hoặc Perfetto)"""
+        pid, tid = os.getpid(), threading.get_ident()
+        trace = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                  'args': {'name': 'GeneticTSP'}}]
+        for phase, start, duration in self.events:
+            trace.append({'name': phase, 'cat': 'GeneticTSP', 'ph': 'X',
+                          'ts': (start - self.origin_ns) / 1000, 'dur': duration / 1000,
+                          'pid': pid, 'tid': tid})
+        return {'traceEvents': trace, 'displayTimeUnit': 'ms',
+                'otherData': {'phases': self.results(),
+                              'dropped_events': self.dropped_events}}
+
+    def export_chrome_trace(self, path):
+        """Ghi Chrome trace-event JSON ra file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+    def report(self):
+        """Bảng tóm tắt dạng văn bản, sắp theo thời gian riêng giảm dần"""
+        rows = sorted(self.results().items(), key=lambda item: -item[1]['self_ns'])
+        total = sum(row['self_ns'] for _, row in rows) or 1
+        lines = [f"{'Pha':<14}{'Số lần':>10}{'Tổng (ms)':>12}{'Riêng (ms)':>12}{'%':>7}"]
+        for phase, row in rows:
+            lines.append(f"{phase:<14}{row['calls']:>10}{row['total_ns'] / 1e6:>12.1f}"
+                         f"{row['self_ns'] / 1e6:>12.1f}{100 * row['self_ns'] / total:>7.1f}")
+        return '\n'.join(lines)
+
+
+# Ví dụ sử dụng
+if __name__ == "__main__":
+    import random
+
+    from nguoidulich import GeneticTSP
+
+    random.seed(42)
+    cities = [[random.uniform(0, 100), random.uniform(0, 100)] for _ in range(200)]
+    for engine in ('list', 'array'):
+        ga = GeneticTSP(cities, generations=300, seed=0, engine=engine, profile=True)
+        ga.evolve(verbose=False)
+        print(f"\nengine='{engine}':")
+        print(ga.profiler.report())
+        print(f"Đã ghi {ga.profiler.export_chrome_trace(f'trace_{engine}.json')}")
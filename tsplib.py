@@ -0,0 +1,193 @@
+import os
+
+import numpy as np
+
+# Thư mục chứa các bộ dữ liệu TSPLIB đi kèm và file lời giải tối ưu đã biết
+INSTANCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tsp_instances')
+
+# Thứ tự đọc phần tử của các định dạng ma trận tường minh (ma trận đối xứng):
+# *_COL tương đương *_ROW của nửa tam giác còn lại
+EXPLICIT_FORMATS = {
+    'FULL_MATRIX': 'full',
+    'UPPER_ROW': 'upper', 'LOWER_COL': 'upper',
+    'LOWER_ROW': 'lower', 'UPPER_COL': 'lower',
+    'UPPER_DIAG_ROW': 'upper_diag', 'LOWER_DIAG_COL': 'upper_diag',
+    'LOWER_DIAG_ROW': 'lower_diag', 'UPPER_DIAG_COL': 'lower_diag',
+}
+
+DATA_SECTIONS = ('NODE_COORD_SECTION', 'DISPLAY_DATA_SECTION', 'EDGE_WEIGHT_SECTION',
+                 'FIXED_EDGES_SECTION', 'TOUR_SECTION')
+
+
+class TSPInstance:
+    def __init__(self, name, dimension, edge_weight_type, distance_matrix,
+                 coords=None, comment=''):
+        """
+        Một bộ dữ liệu TSP đã đọc từ file TSPLIB
+        - distance_matrix: ma trận khoảng cách số nguyên theo quy ước TSPLIB
+        - coords: tọa độ thành phố (None với ma trận tường minh không có DISPLAY_DATA)
+        """
+        self.name = name
+        self.dimension = dimension
+        self.edge_weight_type = edge_weight_type
+        self.distance_matrix = distance_matrix
+        self.coords = coords
+        self.comment = comment
+
+    def tour_length(self, tour):
+        """Độ dài lộ trình theo ma trận khoảng cách của bộ dữ liệu"""
+        tour = np.asarray(tour, dtype=np.intp)
+        return float(self.distance_matrix[tour, np.roll(tour, -1)].sum())
+
+
+def nint(x):
+    """Làm tròn đến số nguyên gần nhất như hàm nint của TSPLIB"""
+    return np.floor(np.asarray(x) + 0.5)
+
+
+def euclidean_matrix(coords, rounding='nint'):
+    """Ma trận khoảng cách Euclidean với cách làm tròn của EUC_2D / CEIL_2D"""
+    diff = coords[:, None, :] - coords[None, :, :]
+    d = np.sqrt((diff ** 2).sum(axis=2))
+    return np.ceil(d) if rounding == 'ceil' else nint(d)
+
+
+def att_matrix(coords):
+    """Khoảng cách giả Euclidean (ATT) của TSPLIB"""
+    diff = coords[:, None, :] - coords[None, :, :]
+    r = np.sqrt((diff ** 2).sum(axis=2) / 10.0)
+    t = nint(r)
+    return np.where(t < r, t + 1, t)
+
+
+def geo_matrix(coords):
+    """Khoảng cách địa lý (GEO) của TSPLIB - tọa độ dạng độ.phút"""
+    pi = 3.141592
+    degrees = np.trunc(coords)
+    radians = pi * (degrees + 5.0 * (coords - degrees) / 3.0) / 180.0
+    latitude, longitude = radians[:, 0], radians[:, 1]
+    q1 = np.cos(longitude[:, None] - longitude[None, :])
+    q2 = np.cos(latitude[:, None] - latitude[None, :])
+    q3 = np.cos(latitude[:, None] + latitude[None, :])
+    rrr = 6378.388
+    inner = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+    d = np.trunc(rrr * np.arccos(inner) + 1.0)
+    np.fill_diagonal(d, 0)
+    return d
+
+
+def explicit_matrix(values, dimension, edge_weight_format):
+    """Dựng ma trận đầy đủ từ dãy EDGE_WEIGHT_SECTION"""
+    layout = EXPLICIT_FORMATS.get(edge_weight_format)
+    if layout is None:
+        raise ValueError(f"EDGE_WEIGHT_FORMAT không được hỗ trợ: {edge_weight_format}")
+    values = np.asarray(values, dtype=np.float64)
+    if layout == 'full':
+        return values[:dimension * dimension].reshape(dimension, dimension)
+
+    matrix = np.zeros((dimension, dimension), dtype=np.float64)
+    offset = {'upper': 1, 'upper_diag': 0, 'lower': -1, 'lower_diag': 0}[layout]
+    if layout.startswith('upper'):
+        rows, cols = np.triu_indices(dimension, k=offset)
+    else:
+        rows, cols = np.tril_indices(dimension, k=offset)
+    count = len(rows)
+    if len(values) < count:
+        raise ValueError(f"Thiếu dữ liệu ma trận: cần {count}, có {len(values)}")
+    matrix[rows, cols] = values[:count]
+    matrix[cols, rows] = values[:count]
+    return matrix
+
+
+def parse_tsplib(text):
+    """Đọc nội dung một file .tsp (TSPLIB) và trả về TSPInstance
+
+    Hỗ trợ EDGE_WEIGHT_TYPE: EUC_2D, CEIL_2D, ATT, GEO và EXPLICIT.
+    """
+    spec = {}
+    coords = {}
+    weights = []
+    section = None
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        keyword = line.split()[0].rstrip(':')
+        if keyword == 'EOF':
+            break
+        if keyword in DATA_SECTIONS:
+            section = keyword
+        elif ':' in line:
+            key, value = line.split(':', 1)
+            spec[key.strip()] = value.strip()
+            section = None
+        elif section in ('NODE_COORD_SECTION', 'DISPLAY_DATA_SECTION'):
+            parts = line.split()
+            coords[int(parts[0])] = [float(parts[1]), float(parts[2])]
+        elif section == 'EDGE_WEIGHT_SECTION':
+            weights.extend(float(value) for value in line.split())
+
+    if spec.get('TYPE', 'TSP').split()[0] not in ('TSP', 'ATSP'):
+        raise ValueError(f"Chỉ hỗ trợ TSP/ATSP, file có TYPE = {spec.get('TYPE')}")
+    dimension = int(spec['DIMENSION'])
+    edge_weight_type = spec.get('EDGE_WEIGHT_TYPE', 'EXPLICIT')
+    coord_array = None
+    if coords:
+        coord_array = np.array([coords[key] for key in sorted(coords)], dtype=np.float64)
+        if len(coord_array) != dimension:
+            raise ValueError(f"Số tọa độ ({len(coord_array)}) khác DIMENSION ({dimension})")
+
+    if edge_weight_type == 'EXPLICIT':
+        matrix = explicit_matrix(weights, dimension, spec.get('EDGE_WEIGHT_FORMAT', 'FULL_MATRIX'))
+    elif coord_array is None:
+        raise ValueError(f"{edge_weight_type} cần NODE_COORD_SECTION")
+    elif edge_weight_type == 'EUC_2D':
+        matrix = euclidean_matrix(coord_array)
+    elif edge_weight_type == 'CEIL_2D':
+        matrix = euclidean_matrix(coord_array, rounding='ceil')
+    elif edge_weight_type == 'ATT':
+        matrix = att_matrix(coord_array)
+    elif edge_weight_type == 'GEO':
+        matrix = geo_matrix(coord_array)
+    else:
+        raise ValueError(f"EDGE_WEIGHT_TYPE không được hỗ trợ: {edge_weight_type}")
+
+    return TSPInstance(spec.get('NAME', ''), dimension, edge_weight_type, matrix,
+                       coords=coord_array.tolist() if coord_array is not None else None,
+                       comment=spec.get('COMMENT', ''))
+
+
+def load_tsplib(path):
+    """Đọc một file .tsp từ đường dẫn"""
+    with open(path, encoding='utf-8') as f:
+        return parse_tsplib(f.read())
+
+
+def load_instance(name):
+    """Đọc bộ dữ liệu đi kèm theo tên (ví dụ 'burma14')"""
+    return load_tsplib(os.path.join(INSTANCE_DIR, f'{name}.tsp'))
+
+
+def bundled_instances():
+    """Tên các bộ dữ liệu đi kèm, sắp xếp theo số thành phố"""
+    names = [file[:-4] for file in os.listdir(INSTANCE_DIR) if file.endswith('.tsp')]
+    return sorted(names, key=lambda name: (load_instance(name).dimension, name))
+
+
+def instance_key(name):
+    """Tên chuẩn hóa của bộ dữ liệu: bỏ thư mục và đuôi .tsp (NAME trong file
+    có thể là 'ulysses16.tsp' trong khi tên file là 'ulysses16')"""
+    name = os.path.basename(name.strip())
+    return name[:-4] if name.endswith('.tsp') else name
+
+
+def known_optima():
+    """Độ dài lộ trình tối ưu đã biết, đọc từ file 'solutions' (dạng 'tên : giá trị'),
+    khóa theo instance_key"""
+    optima = {}
+    with open(os.path.join(INSTANCE_DIR, 'solutions'), encoding='utf-8') as f:
+        for line in f:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                optima[instance_key(name)] = float(value.split()[0])
+    return optima